@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+
+        # django.contrib.auth (earlier in INSTALLED_APPS) connected its own
+        # update_last_login under this dispatch_uid; swap in the throttled one.
+        user_logged_in.disconnect(dispatch_uid="update_last_login")
+
+        from . import signals  # noqa: F401
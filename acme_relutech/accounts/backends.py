@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+from .hashing import run_hashing
+
+UserModel = get_user_model()
+
+
+def verify_password(password, encoded):
+    """
+    Return whether ``password`` matches ``encoded``, and its new hash when
+    the stored one needs upgrading. Only hashes, so it can run in the pool.
+    """
+    upgraded = []
+    valid = check_password(
+        password, encoded, lambda raw: upgraded.append(make_password(raw))
+    )
+    return valid, upgraded[0] if upgraded else None
+
+
+class BoundedModelBackend(ModelBackend):
+    """
+    ModelBackend that runs the password hashing in the bounded pool of
+    ``accounts.hashing``, while the queries stay on the request thread.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway, so unknown usernames take as long (#20760).
+            run_hashing(make_password, password)
+            return None
+
+        valid, upgraded = run_hashing(verify_password, password, user.password)
+        if not valid:
+            return None
+        if upgraded is not None:
+            # As AbstractBaseUser.check_password() does: not a password change.
+            user.password = upgraded
+            user.save(update_fields=["password"])
+        return user if self.user_can_authenticate(user) else None
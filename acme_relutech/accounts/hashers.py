@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, must_update_salt
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the iteration count of ``PASSWORD_HASH_ITERATIONS``, so each
+    environment can trade login cost against brute-force resistance. It keeps
+    Django's algorithm name: existing hashes still verify, and those with
+    fewer iterations are re-hashed at the configured count on the next
+    successful login. Stronger hashes are kept, never weakened.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, "PASSWORD_HASH_ITERATIONS", PBKDF2PasswordHasher.iterations
+        )
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return decoded["iterations"] < self.iterations or must_update_salt(
+            decoded["salt"], self.salt_entropy
+        )
@@ -0,0 +1,89 @@
+"""
+Bounded password verification.
+
+Password hashing is CPU bound and deliberately slow, so a burst of logins
+running it on request threads would leave none for other requests.
+``BoundedModelBackend`` therefore hands the hashing to a pool of
+``LOGIN_HASHING_CONCURRENCY`` threads per process, with room for
+``LOGIN_HASHING_QUEUE`` more logins waiting for one. A login that finds the
+pool and its queue full raises ``PasswordHashingBusy`` at once, and so does
+one that waited more than ``LOGIN_HASHING_TIMEOUT`` seconds for its result;
+``PasswordHashingBusyMiddleware`` answers both with a 503 so the client
+retries later.
+
+The limit is per process: it bounds the threads a threaded or ASGI worker
+spends waiting on logins. A sync worker serves one request at a time
+anyway, so there the number of workers is the bound.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_pool = None
+
+
+class PasswordHashingBusy(Exception):
+    pass
+
+
+def get_concurrency():
+    return getattr(settings, "LOGIN_HASHING_CONCURRENCY", 4)
+
+
+def get_queue_size():
+    return getattr(settings, "LOGIN_HASHING_QUEUE", 2 * get_concurrency())
+
+
+class HashingPool:
+    def __init__(self, workers, queue_size):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="login-hashing")
+        # Running and waiting jobs; the executor's own queue is unbounded.
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def submit(self, function, *args):
+        """Queue ``function(*args)``, or raise ``PasswordHashingBusy`` if full."""
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHashingBusy
+
+        def job():
+            try:
+                return function(*args)
+            finally:
+                self.slots.release()
+
+        try:
+            return self.executor.submit(job)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def run(self, function, *args):
+        future = self.submit(function, *args)
+        try:
+            return future.result(getattr(settings, "LOGIN_HASHING_TIMEOUT", 5))
+        except FutureTimeoutError:
+            # The job still finishes, and frees its slot, in the pool.
+            raise PasswordHashingBusy
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+def get_pool():
+    global _pool
+    key = (get_concurrency(), get_queue_size())
+    with _lock:
+        # Rebuilt when the settings change, e.g. under override_settings().
+        if _pool is None or _pool[0] != key:
+            if _pool is not None:
+                _pool[1].shutdown()
+            _pool = (key, HashingPool(*key))
+        return _pool[1]
+
+
+def run_hashing(function, *args):
+    """Return ``function(*args)``, run in the hashing pool."""
+    return get_pool().run(function, *args)
@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+
+from .hashing import PasswordHashingBusy
+
+
+class PasswordHashingBusyMiddleware:
+    """Turn a login the hashing pool turned away into a 503."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, PasswordHashingBusy):
+            return JsonResponse(
+                {"error": "Too many logins in progress, please retry."},
+                status=503,
+                headers={"Retry-After": "1"},
+            )
+        return None
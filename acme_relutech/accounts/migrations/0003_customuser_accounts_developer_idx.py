@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_customuser_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("is_admin", False)),
+                fields=["username", "email"],
+                name="accounts_developer_idx",
+            ),
+        ),
+    ]
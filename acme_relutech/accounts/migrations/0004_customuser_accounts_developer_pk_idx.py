@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_customuser_accounts_developer_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("is_admin", False)),
+                fields=["id"],
+                name="accounts_developer_pk_idx",
+            ),
+        ),
+    ]
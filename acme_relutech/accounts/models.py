@@ -47,6 +47,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     username = models.CharField(max_length=30, unique=True)
     is_active = models.BooleanField(default=True)
     is_admin = models.BooleanField(default=False)
+    modified = models.DateTimeField(auto_now=True, db_index=True)
 
     groups = models.ManyToManyField(
         Group, blank=True, related_name="custom_users", related_query_name="custom_user"
@@ -63,5 +64,21 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    class Meta:
+        indexes = [
+            # Developer listings always filter on is_admin=False.
+            models.Index(
+                fields=["username", "email"],
+                condition=models.Q(is_admin=False),
+                name="accounts_developer_idx",
+            ),
+            # The inventory lists them in primary key order.
+            models.Index(
+                fields=["id"],
+                condition=models.Q(is_admin=False),
+                name="accounts_developer_pk_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.username
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+@receiver(user_logged_in, dispatch_uid="update_last_login")
+def update_last_login(sender, user, **kwargs):
+    """
+    Replace django.contrib.auth's receiver of the same name, writing
+    ``last_login`` at most once per ``LAST_LOGIN_UPDATE_INTERVAL`` seconds so
+    clients that log in for every job do not UPDATE the user each time.
+    ``last_login`` is then accurate to that interval.
+    """
+    now = timezone.now()
+    interval = timedelta(seconds=getattr(settings, "LAST_LOGIN_UPDATE_INTERVAL", 0))
+    if user.last_login is not None and now - user.last_login < interval:
+        return
+    user.last_login = now
+    user.save(update_fields=["last_login"])
@@ -1,5 +1,18 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .hashers import ConfigurablePBKDF2PasswordHasher
+from .hashing import get_pool
 from .models import CustomUser
 
 
@@ -20,3 +33,351 @@ class CustomUserTestCase(TestCase):
         self.assertEqual(user.username, "root")
         self.assertTrue(user.is_admin)
         self.assertTrue(user.is_superuser)
+
+
+class LastLoginTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="dev@acme.com", username="devuser", password="devuserpassword"
+        )
+
+    def login(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse("api:login"),
+                {"username": "devuser", "password": "devuserpassword"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "accounts_customuser"')
+        ]
+
+    @override_settings(LAST_LOGIN_UPDATE_INTERVAL=300)
+    def test_last_login_throttled(self):
+        self.assertEqual(len(self.login()), 1)
+        first_login = self.user.last_login
+        self.assertIsNotNone(first_login)
+
+        self.assertEqual(self.login(), [])
+        self.assertEqual(self.user.last_login, first_login)
+
+        CustomUser.objects.filter(pk=self.user.pk).update(
+            last_login=timezone.now() - timedelta(seconds=301)
+        )
+        self.assertEqual(len(self.login()), 1)
+        self.assertGreater(self.user.last_login, first_login)
+
+    @override_settings(LAST_LOGIN_UPDATE_INTERVAL=0)
+    def test_last_login_every_login(self):
+        self.assertEqual(len(self.login()), 1)
+        first_login = self.user.last_login
+        self.assertEqual(len(self.login()), 1)
+        self.assertGreater(self.user.last_login, first_login)
+
+
+class LoginHashingTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="dev@acme.com", username="devuser", password="devuserpassword"
+        )
+        self.credentials = {"username": "devuser", "password": "devuserpassword"}
+
+    def test_register_logs_in_without_rehashing(self):
+        with mock.patch.object(
+            ConfigurablePBKDF2PasswordHasher, "verify", autospec=True
+        ) as verify:
+            response = self.client.post(
+                reverse("register"),
+                {
+                    "username": "newuser",
+                    "email": "newuser@acme.com",
+                    "password1": "Str0ng-pass-123",
+                    "password2": "Str0ng-pass-123",
+                },
+            )
+        self.assertRedirects(response, reverse("dashboard"))
+        verify.assert_not_called()
+        user = CustomUser.objects.get(username="newuser")
+        self.assertEqual(int(self.client.session["_auth_user_id"]), user.pk)
+
+    def test_configurable_iterations(self):
+        with self.settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.assertTrue(make_password("secret").startswith("pbkdf2_sha256$1000$"))
+            self.user.set_password("devuserpassword")
+            self.user.save()
+
+        # Weaker hashes still verify and are upgraded on login.
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            response = self.client.post(reverse("api:login"), self.credentials)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_stronger_hashes_kept(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$600000$"))
+        password = self.user.password
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse("api:login"), self.credentials)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+        self.assertFalse(
+            any(
+                query["sql"].startswith('UPDATE "accounts_customuser" SET "password"')
+                for query in context.captured_queries
+            )
+        )
+
+    @override_settings(LOGIN_HASHING_CONCURRENCY=1, LOGIN_HASHING_QUEUE=0)
+    def test_login_rejected_when_hashing_pool_full(self):
+        release = threading.Event()
+        busy = get_pool().submit(release.wait)
+        try:
+            start = time.monotonic()
+            response = self.client.post(reverse("api:login"), self.credentials)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "1")
+
+            response = self.client.post(
+                reverse("login"), self.credentials, content_type="application/json"
+            )
+            self.assertEqual(response.status_code, 503)
+            # Turned away at once rather than after LOGIN_HASHING_TIMEOUT.
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            release.set()
+            busy.result()
+
+        response = self.client.post(reverse("api:login"), self.credentials)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        LOGIN_HASHING_CONCURRENCY=1, LOGIN_HASHING_QUEUE=1, LOGIN_HASHING_TIMEOUT=0.1
+    )
+    def test_queued_login_times_out(self):
+        release = threading.Event()
+        busy = get_pool().submit(release.wait)
+        try:
+            response = self.client.post(reverse("api:login"), self.credentials)
+            self.assertEqual(response.status_code, 503)
+        finally:
+            release.set()
+            busy.result()
+
+    def test_hashing_runs_in_pool(self):
+        threads = []
+        verify = ConfigurablePBKDF2PasswordHasher.verify
+
+        def record(hasher, password, encoded):
+            threads.append(threading.current_thread().name)
+            return verify(hasher, password, encoded)
+
+        with mock.patch.object(
+            ConfigurablePBKDF2PasswordHasher, "verify", autospec=True
+        ) as patched:
+            patched.side_effect = record
+            response = self.client.post(reverse("api:login"), self.credentials)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("login-hashing"))
+
+
+class DashboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        for name in ("carol", "alice", "bob"):
+            CustomUser.objects.create_user(
+                username=name, email=f"{name}@acme.com", password="testpass"
+            )
+        self.url = reverse("dashboard")
+        self.client.force_login(self.admin_user)
+
+    def xhr(self, params):
+        return self.client.get(self.url, params, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+
+    def test_first_page_rendered(self):
+        """
+        Test that the page renders the first page of developers in username
+        order, with the cursor of the next one.
+        """
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'data-username="alice"')
+        self.assertContains(response, 'data-username="bob"')
+        self.assertLess(
+            response.content.index(b'data-username="alice"'),
+            response.content.index(b'data-username="bob"'),
+        )
+        self.assertContains(response, 'data-next="bob"')
+        self.assertContains(
+            response,
+            reverse(
+                "api:asset-assignments",
+                args=[CustomUser.objects.get(username="alice").pk],
+            ),
+        )
+        self.assertNotContains(response, "carol")
+
+    def test_next_pages_and_search(self):
+        """
+        Test that XHR requests page through the developers and search them.
+        """
+        response = self.xhr({"after": "bob", "limit": 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([row["username"] for row in data["results"]], ["carol"])
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            set(data["results"][0]),
+            {
+                "id",
+                "username",
+                "email",
+                "last_login",
+                "is_active",
+                "assets_url",
+                "licenses_url",
+            },
+        )
+
+        data = self.xhr({"q": "B"}).json()
+        self.assertEqual([row["username"] for row in data["results"]], ["bob"])
+
+        response = self.xhr({"limit": "many"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_queries_do_not_grow(self):
+        """
+        Test that the page runs the same queries with many more developers.
+        """
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        CustomUser.objects.bulk_create(
+            CustomUser(username=f"dev{number:03}", email=f"dev{number}@acme.com")
+            for number in range(200)
+        )
+        # bulk_create() sends no signals to invalidate the cached list.
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertEqual(len(many), len(few))
+        self.assertContains(response, "<li data-username=", count=50)
+
+    def test_developer_list_cached(self):
+        """
+        Test that the rendered developer list is served from the cache until
+        the developers change.
+        """
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(self.url)
+        self.assertLess(len(warm), len(cold))
+        self.assertNotContains(response, "dave")
+
+        CustomUser.objects.create_user(
+            username="dave", email="dave@acme.com", password="testpass"
+        )
+        self.assertContains(self.client.get(self.url), 'data-username="dave"')
+
+    def test_non_superuser(self):
+        """
+        Test that users other than superusers get neither developers nor
+        their JSON.
+        """
+        self.client.force_login(CustomUser.objects.get(username="alice"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("developer_list", response.context)
+        self.assertEqual(self.xhr({}).status_code, 403)
+
+
+class CreateDeveloperTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        CustomUser.objects.create_user(
+            username="alice", email="alice@acme.com", password="testpass"
+        )
+        self.url = reverse("create_developer")
+        self.client.force_login(self.admin_user)
+
+    def xhr_post(self, username, version):
+        return self.client.post(
+            self.url,
+            {
+                "username": username,
+                "email": f"{username}@acme.com",
+                "password1": "Str0ng-pass-123",
+                "password2": "Str0ng-pass-123",
+                "version": version,
+            },
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+    def get_version(self):
+        return self.client.get(
+            reverse("dashboard"), HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        ).json()["version"]
+
+    def test_xhr_returns_only_new_developer(self):
+        """
+        Test that creating a developer returns it and the new version, which
+        the next creation accepts as current.
+        """
+        version = self.get_version()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_X_REQUESTED_WITH="XMLHttpRequest").json(),
+            {"version": version},
+        )
+
+        response = self.xhr_post("bob", version)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(set(data), {"developer", "version", "stale"})
+        self.assertEqual(data["developer"]["username"], "bob")
+        self.assertFalse(CustomUser.objects.get(username="bob").is_admin)
+        self.assertFalse(data["stale"])
+        self.assertNotEqual(data["version"], version)
+
+        data = self.xhr_post("carol", data["version"]).json()
+        self.assertFalse(data["stale"])
+        self.assertEqual(data["version"], self.get_version())
+
+    def test_stale_version(self):
+        """
+        Test that a client that missed other changes is told to reload.
+        """
+        version = self.get_version()
+        CustomUser.objects.create_user(
+            username="dave", email="dave@acme.com", password="testpass"
+        )
+        self.assertTrue(self.xhr_post("bob", version).json()["stale"])
+        self.assertTrue(self.xhr_post("carol", "").json()["stale"])
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_no_version_without_cache(self):
+        """
+        Test that without the API cache, whose counters could differ between
+        workers, clients get no version and always reload after a creation.
+        """
+        self.assertIsNone(self.get_version())
+        self.assertContains(self.client.get(reverse("dashboard")), 'data-version=""')
+        self.assertTrue(self.xhr_post("bob", "").json()["stale"])
+        self.assertTrue(self.xhr_post("carol", "None").json()["stale"])
+
+    def test_xhr_invalid_form(self):
+        response = self.xhr_post("alice", self.get_version())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.json()["errors"])
@@ -2,15 +2,22 @@ import json
 
 from accounts.forms import CustomUserCreationForm
 from accounts.serializers import DeveloperSerializer
+from api.cache import ALL, DEVELOPERS, cache_enabled, cached_data, get_versions
+from api.pagination import UsernameKeysetPagination
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model, login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
+from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
+from rest_framework import status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from .models import CustomUser
@@ -20,10 +27,9 @@ def register(request):
     if request.method == "POST":
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
-            form.save()
-            username = form.cleaned_data.get("username")
-            password = form.cleaned_data.get("password1")
-            user = authenticate(username=username, password=password)
+            # The form just hashed the password; authenticate() would hash it
+            # again to get the same user back.
+            user = form.save()
             login(request, user)
             return redirect("dashboard")
     else:
@@ -58,56 +64,164 @@ class CustomLoginView(LoginView):
         return JsonResponse({"success": True})
 
 
+def get_developer_page(request):
+    """
+    Return one page of developers, as dicts, and the cursor of the next one.
+
+    ``?after=<username>`` and ``?limit=`` walk the partial developer index in
+    username order, so every page costs the same however many developers
+    there are; ``?q=`` keeps those whose username or email starts with it.
+    """
+    developers = CustomUser.objects.get_developers().only(
+        "username", "email", "last_login", "is_active"
+    )
+    search = request.GET.get("q", "").strip()
+    if search:
+        developers = developers.filter(
+            Q(username__istartswith=search) | Q(email__istartswith=search)
+        )
+
+    paginator = UsernameKeysetPagination()
+    after, limit = paginator.get_bounds(request.GET) or (None, paginator.default_limit)
+    page = paginator.get_page(
+        list(paginator.get_page_queryset(developers, after, limit)), limit
+    )
+    return get_developer_rows(page), paginator.next_cursor
+
+
+def get_developer_rows(developers):
+    """The dashboard's JSON for ``developers``, with their inventory URLs."""
+    return [
+        {
+            "id": developer.pk,
+            **data,
+            "assets_url": reverse("api:asset-assignments", args=[developer.pk]),
+            "licenses_url": reverse("api:license-assignments", args=[developer.pk]),
+        }
+        for developer, data in zip(
+            developers, DeveloperSerializer(developers, many=True).data
+        )
+    ]
+
+
 @login_required
 def dashboard(request):
     user = request.user
-
-    if user.is_superuser:
-        developers = CustomUser.objects.get_developers()
-        print(f"{developers=}")
-        context = {
+    xhr = request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest"
+
+    if not user.is_superuser:
+        if xhr:
+            return JsonResponse({"error": "Not authorized"}, status=403)
+        return render(request, "dashboard.html", {"user": user})
+
+    # Read before the page, so a write racing it leaves the client stale.
+    version = get_developers_version()
+    try:
+        if xhr:
+            developers, next_cursor = get_developer_page(request)
+            return JsonResponse(
+                {"results": developers, "next": next_cursor, "version": version}
+            )
+        developer_list = cached_data(
+            "dashboard",
+            [(DEVELOPERS, ALL)],
+            lambda: render_developer_list(request, version),
+            params=request.GET,
+        )
+    except ValidationError as error:
+        return JsonResponse(error.detail, status=400)
+
+    return render(
+        request,
+        "dashboard.html",
+        {
             "user": user,
-            "developers": developers,
-        }
-    else:
-        context = {
-            "user": user,
-        }
+            "developer_list": developer_list,
+            "search": request.GET.get("q", "").strip(),
+            "form": CustomUserCreationForm(),
+        },
+    )
 
-    if request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest":
-        # developers_json = serialize('json', developers)
-        developers_json = DeveloperSerializer(developers, many=True).data
-        return JsonResponse({"developers": developers_json})
-    else:
-        return render(request, "dashboard.html", context)
+
+def render_developer_list(request, version):
+    """
+    The rendered first page of developers, the same for every superuser
+    until the developers change, so the dashboard caches it.
+    """
+    developers, next_cursor = get_developer_page(request)
+    return render_to_string(
+        "dashboard_developers.html",
+        {"developers": developers, "next_cursor": next_cursor, "version": version},
+    )
 
 
 User = get_user_model()
 
 
+def get_developers_version():
+    """
+    The developers' counter of the versioned API cache. It is only off
+    where workers would each keep counters of their own (see ``api.cache``),
+    and then there is no version: clients without one reload their list.
+    """
+    if not cache_enabled():
+        return None
+    return get_versions([(DEVELOPERS, ALL)])[0]
+
+
+def is_current_version(client_version, before, after):
+    """
+    Whether a client that had seen ``client_version`` of the developers has
+    seen everything but the write that moved the counter from ``before`` to
+    ``after``. A save bumps it twice (see ``api.cache.invalidate``), so a
+    larger step is someone else's write, and a reseeded counter a huge one.
+    """
+    if before is None or after is None:
+        return False
+    try:
+        return int(client_version) == before and after - before <= 2
+    except (TypeError, ValueError):
+        return False
+
+
 @api_view(["POST", "GET"])
 @login_required
 def create_developer(request):
+    xhr = request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest"
+
     if request.method == "POST":
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
-            print("form valid")
+            before = get_developers_version() if xhr else None
             user = form.save(commit=False)
             user.is_admin = False
             user.save()
+            if xhr:
+                # Only the new developer: the client merges it into its
+                # list, or reloads the list when it missed other changes.
+                after = get_developers_version()
+                return Response(
+                    {
+                        "developer": get_developer_rows([user])[0],
+                        "version": after,
+                        "stale": not is_current_version(
+                            request.POST.get("version"), before, after
+                        ),
+                    },
+                    status=status.HTTP_201_CREATED,
+                )
             messages.success(request, "Developer user created successfully.")
-            if request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest":
-                developers = CustomUser.objects.get_developers()
-                developers_json = DeveloperSerializer(developers, many=True).data
-                return Response({"developers": developers_json})
-            else:
-                return redirect("dashboard")
+            return redirect("dashboard")
+        if xhr:
+            return Response(
+                {"errors": form.errors.get_json_data()},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
     else:
-        print("algo")
         form = CustomUserCreationForm()
 
-    if request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest":
-        print("hola")
-        return Response({"form": str(form)})
-    else:
-        return render(request, "create_developer.html", {"form": form})
+    if xhr:
+        # The dashboard renders the form itself; clients only need to know
+        # whether their list is current.
+        return Response({"version": get_developers_version()})
+    return render(request, "create_developer.html", {"form": form})
@@ -0,0 +1,18 @@
+"""
+Import guard for the optional packages a deployment leaves out.
+
+Some libraries probe for optional dependencies with ``try: import ...`` at
+import time and pay for whatever they find. A ``None`` entry in
+``sys.modules`` makes such an import raise ImportError, so listing a module
+in the ``HIDDEN_MODULES`` setting makes it look absent to everything the
+WSGI application imports afterwards.
+"""
+import sys
+
+from django.conf import settings
+
+
+def hide_modules():
+    """Hide the ``HIDDEN_MODULES`` not imported yet; call before setup."""
+    for module in getattr(settings, "HIDDEN_MODULES", ()):
+        sys.modules.setdefault(module, None)
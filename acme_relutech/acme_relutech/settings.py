@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,11 +47,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
+    "api.middleware.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "accounts.middleware.PasswordHashingBusyMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -83,9 +87,88 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Keep connections open across requests, checked before reuse.
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Read replicas (see api/routers.py): DJANGO_DATABASE_REPLICAS lists SQLite
+# files that an external replicator (Litestream, LiteFS, ...) keeps in sync
+# with the primary, each added as a "replica<N>" database. Clients read from
+# the primary for DATABASE_REPLICA_PIN_SECONDS after they write, which should
+# cover the replication lag.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.environ.get("DJANGO_DATABASE_REPLICAS", "").split(",")), 1
+):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "NAME": name,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{number}")
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = 5
+DATABASE_REPLICA_PIN_COOKIE = "db_primary"
+
+# Pragmas run on every new SQLite connection (see api/sqlite.py). Set
+# DJANGO_SQLITE_TUNING=0 for SQLite's defaults (rollback journal, full sync).
+SQLITE_PRAGMAS = {}
+if os.environ.get("DJANGO_SQLITE_TUNING", "1") == "1":
+    SQLITE_PRAGMAS = {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "busy_timeout": int(os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative sizes are in KiB: 64 MiB of page cache per connection.
+        "cache_size": -64 * 1024,
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Inventory GET responses are cached under per-collection version counters
+# (see api/cache.py). Point API_CACHE_ALIAS at a shared backend such as Redis
+# or Memcached when running more than one worker process: "manage.py serve"
+# turns the cache off for several workers sharing a LocMemCache.
+API_CACHE_ENABLED = True
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = 300
+
+
+# Request metrics
+# Query count and DB/serialize/render/total times of every request are sent
+# in a Server-Timing header and logged on "api.requests" (see
+# api/middleware.py). Requests over either threshold also log their queries,
+# as warnings; every other request logs at INFO, which the default level of
+# DJANGO_REQUEST_LOG_LEVEL leaves out.
+
+REQUEST_METRICS_ENABLED = True
+REQUEST_METRICS_SLOW_MS = 500
+REQUEST_METRICS_SLOW_QUERIES = 50
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("DJANGO_REQUEST_LOG_LEVEL", "WARNING"),
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -106,6 +189,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+PASSWORD_HASHERS = [
+    "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# PBKDF2 iterations of new and upgraded hashes; Django 4.2 uses 600000.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", 600000))
+
+AUTHENTICATION_BACKENDS = ["accounts.backends.BoundedModelBackend"]
+
+# Threads hashing passwords per process (see accounts/hashing.py), logins
+# that may wait for one, and how long a login waits for its result; logins
+# beyond the queue, or waiting longer, are answered with a 503.
+LOGIN_HASHING_CONCURRENCY = int(os.environ.get("LOGIN_HASHING_CONCURRENCY", 4))
+LOGIN_HASHING_QUEUE = int(os.environ.get("LOGIN_HASHING_QUEUE", 8))
+LOGIN_HASHING_TIMEOUT = 5
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -130,6 +234,57 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.CustomUser"
 
+# Build read-only list responses straight from values_list() rows instead of
+# instantiating models and ModelSerializers (see api/values.py).
+FAST_READ_SERIALIZERS = False
+
+# Serve the developer, asset and license endpoints with the native async views
+# of api/async_views.py. Only worth it under an ASGI server (acme_relutech.asgi).
+API_ASYNC_VIEWS = False
+
+REST_FRAMEWORK = {
+    # Sessions serve the browser; API clients send "Authorization: Bearer"
+    # tokens from /api/v1/user/token/ (see api/authentication.py). Basic
+    # authentication, DRF's default, stays for existing clients; it hashes
+    # the password on every request, so tokens are the faster choice.
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "api.authentication.SignedTokenAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+}
+
+# Group commit of asset and license creation (see api/writequeue.py): one
+# writer thread per process commits up to MAX_BATCH writes at once, waiting
+# up to MAX_DELAY_MS for them. Only useful with threaded or ASGI workers.
+API_WRITE_QUEUE = os.environ.get("DJANGO_WRITE_QUEUE") == "1"
+API_WRITE_QUEUE_MAX_BATCH = 64
+API_WRITE_QUEUE_MAX_DELAY_MS = 2
+API_WRITE_QUEUE_TIMEOUT = 10
+
+# Lifetime of API tokens, and how long the user they name stays cached (only
+# in a shared API cache, see api/authentication.py).
+API_TOKEN_MAX_AGE = 12 * 60 * 60
+API_TOKEN_PRINCIPAL_TIMEOUT = 300
+
+# OpenAPI schema, written by "manage.py generate_schema" and served from
+# memory at /swagger.json (see api/schema.py). The Swagger and ReDoc pages
+# load it from there instead of introspecting the API on every hit.
+API_SCHEMA_FILE = BASE_DIR / "openapi.json"
+# Generate the schema once per process when the file is missing.
+API_SCHEMA_GENERATE = True
+API_SCHEMA_CACHE_SECONDS = 24 * 60 * 60
+SWAGGER_CACHE_TIMEOUT = 60 * 60
+SWAGGER_SETTINGS = {
+    "SPEC_URL": "schema-json",
+    "DEFAULT_GENERATOR_CLASS": "api.generators.SchemaGenerator",
+}
+REDOC_SETTINGS = {"SPEC_URL": "schema-json"}
+
+
+# Logins write last_login at most once per this many seconds per user (see
+# accounts/signals.py); 0 writes it on every login like Django does.
+LAST_LOGIN_UPDATE_INTERVAL = 300
 
 LOGIN_REDIRECT_URL = "/accounts/dashboard/"
 LOGIN_URL = "login"
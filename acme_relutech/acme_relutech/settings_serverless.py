@@ -0,0 +1,40 @@
+"""
+Settings for the serverless (Vercel) deployment.
+
+Every cold start imports the project before it serves its first request, so
+this profile leaves out what a stateless API function never uses: the
+admin, static files and drf-yasg. /swagger.json only serves the file
+written by "manage.py generate_schema" (run it before deploying), since
+generating the schema needs coreapi; the Swagger and ReDoc pages are not
+served. "manage.py importtime" and "manage.py bench_startup" show what a
+cold start costs.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import API_CACHE_ALIAS, CACHES, INSTALLED_APPS
+
+# Django REST framework imports coreapi (a drf-yasg dependency) whenever it
+# is installed, and it scans every installed distribution through
+# pkg_resources. Only schema generation uses it, which is off here, so the
+# WSGI module hides it (see acme_relutech/imports.py).
+HIDDEN_MODULES = ["coreapi"]
+
+API_SCHEMA_GENERATE = False
+
+# Every instance is a process of its own: with a local-memory cache, a write
+# served by one would leave the others serving stale lists and 304s.
+API_CACHE_ENABLED = (
+    CACHES[API_CACHE_ALIAS]["BACKEND"]
+    != "django.core.cache.backends.locmem.LocMemCache"
+)
+
+DEBUG = os.environ.get("DJANGO_DEBUG") == "1"
+
+ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", ".vercel.app").split(",")
+
+INSTALLED_APPS = [
+    app
+    for app in INSTALLED_APPS
+    if app not in {"django.contrib.admin", "django.contrib.staticfiles", "drf_yasg"}
+]
@@ -14,34 +14,29 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from api.schema import schema_json, schema_ui
+from django.apps import apps
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
 
 # from django.conf.urls import url
-from rest_framework import permissions, routers
+from rest_framework import routers
 
 router = routers.DefaultRouter()
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="ACME",
-        default_version="v1",
-        description="Acme docs EPs details.",
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
-
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("accounts/", include("accounts.urls")),
     path("api/", include("api.urls")),
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("swagger.json", schema_json, name="schema-json"),
 ]
+
+# Both are left out of the serverless settings (acme_relutech.settings_serverless).
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+
+if apps.is_installed("drf_yasg"):
+    urlpatterns += [
+        path("swagger/", schema_ui("swagger"), name="schema-swagger-ui"),
+        path("redoc/", schema_ui("redoc"), name="schema-redoc"),
+    ]
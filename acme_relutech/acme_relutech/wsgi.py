@@ -18,6 +18,15 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_blog.settings")
+from acme_relutech.imports import hide_modules
+
+# Vercel sets VERCEL=1 in its functions.
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    "acme_relutech.settings_serverless"
+    if os.environ.get("VERCEL")
+    else "acme_relutech.settings",
+)
+hide_modules()
 application = get_wsgi_application()
 app = application
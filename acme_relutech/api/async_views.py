@@ -0,0 +1,362 @@
+"""
+Native async versions of the developer, asset and license endpoints.
+
+``api/urls.py`` routes to these instead of the APIView classes of
+``api.views`` when ``API_ASYNC_VIEWS`` is on. They answer with the same
+payloads but read through Django's async ORM (``afirst``, ``acreate``,
+``adelete``, ``async for``), so an ASGI worker keeps serving other
+connections while one request waits on a slow client.
+
+Django 4.2 has no async session backend and no async prefetching, so the
+user lookup and the form/serializer validation that query the database run
+in a thread, and every list is built from ``values_list`` rows (see
+``api.values``). The versioned response cache and the conditional GETs
+stay on the sync views: their backend calls are blocking
+and would put a thread hop back on every request.
+"""
+import json
+from collections import defaultdict
+
+from accounts.forms import CustomUserCreationForm
+from accounts.models import CustomUser
+from accounts.serializers import DeveloperSerializer
+from asgiref.sync import sync_to_async
+from assets.models import Asset
+from assets.serializers import AssetSerializer
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from licenses.models import License
+from licenses.serializers import LicenseSerializer
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    PermissionDenied,
+    ValidationError,
+)
+
+from .authentication import aget_token_user, get_request_token
+from .metrics import timed
+from .pagination import KeysetPagination
+from .responses import get_return_preference, preferred_json_response
+from .serializers import split_inventory
+
+
+class InvalidBody(Exception):
+    pass
+
+
+async def get_user(request):
+    """
+    Return the user of a bearer token (see ``api.authentication``) or else
+    resolve ``request.user`` (a session and a user query) in a thread.
+
+    The views are CSRF exempt, so, as DRF's ``SessionAuthentication`` does,
+    the CSRF check runs here for session-authenticated requests only.
+    """
+    token = get_request_token(request)
+    if token is not None:
+        return await aget_token_user(token)
+
+    def load():
+        user = request.user
+        if user.is_authenticated:
+            SessionAuthentication().enforce_csrf(request)
+        return user
+
+    return await sync_to_async(load)()
+
+
+def get_data(request):
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            raise InvalidBody
+    return request.POST
+
+
+def not_authorized():
+    return JsonResponse(
+        {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
+    )
+
+
+def not_found(name):
+    return JsonResponse(
+        {"error": f"{name} not found"}, status=status.HTTP_404_NOT_FOUND
+    )
+
+
+async def fetch_rows(serializer_class, queryset):
+    """Fetch the ``value_columns`` tuples of ``serializer_class``."""
+    columns = serializer_class.value_columns
+    return [row async for row in queryset.values_list(*columns)]
+
+
+def serialize_rows(serializer_class, rows):
+    with timed("serialize"):
+        return serializer_class.values_data(rows)
+
+
+async def values_rows(serializer_class, queryset):
+    """Async fast-path equivalent of ``serializer_class(queryset, many=True)``."""
+    return serialize_rows(
+        serializer_class, await fetch_rows(serializer_class, queryset)
+    )
+
+
+async def values_rows_by_developer(serializer_class, queryset, developers):
+    grouped = defaultdict(list)
+    queryset = queryset.filter(developer__in=developers.values("pk"))
+    for item in await values_rows(
+        serializer_class, queryset.order_by("developer", "pk")
+    ):
+        grouped[item["developer"]].append(item)
+    return grouped
+
+
+async def developer_list():
+    developers = CustomUser.objects.filter(is_admin=False)
+    return DeveloperSerializer([user async for user in developers], many=True).data
+
+
+class AsyncView(View):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Like APIView: token requests carry no CSRF token, see get_user().
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except AuthenticationFailed as error:
+            return JsonResponse(
+                {"detail": error.detail}, status=status.HTTP_401_UNAUTHORIZED
+            )
+        except PermissionDenied as error:
+            return JsonResponse(
+                {"detail": error.detail}, status=status.HTTP_403_FORBIDDEN
+            )
+        except InvalidBody:
+            return JsonResponse(
+                {"detail": "JSON parse error"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except ValidationError as error:
+            return JsonResponse(error.detail, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncDevelopersView(AsyncView):
+    async def get(self, request):
+        user = await get_user(request)
+        if not user.is_authenticated:
+            return JsonResponse({}, status=status.HTTP_401_UNAUTHORIZED)
+
+        if not user.is_admin:
+            return JsonResponse({}, status=status.HTTP_403_FORBIDDEN)
+
+        inventory = await self.get_inventory()
+        if request.GET.get("shape") == "merged":
+            return JsonResponse(inventory, safe=False)
+
+        return JsonResponse(split_inventory(inventory))
+
+    async def get_inventory(self):
+        # Served in primary key order, as it always was.
+        developers = CustomUser.objects.get_developers().order_by("pk")
+        assets = await values_rows_by_developer(
+            AssetSerializer, Asset.objects.all(), developers
+        )
+        licenses = await values_rows_by_developer(
+            LicenseSerializer, License.objects.all(), developers
+        )
+        return [
+            {
+                "id": pk,
+                "username": username,
+                "email": email,
+                "assets": assets[pk],
+                "licenses": licenses[pk],
+            }
+            async for pk, username, email in developers.values_list(
+                "id", "username", "email"
+            )
+        ]
+
+    async def post(self, request):
+        user = await get_user(request)
+        if not user.is_authenticated or not user.is_admin:
+            return not_authorized()
+
+        data = get_data(request)
+
+        def create():
+            # Validation checks uniqueness and hashing the password is CPU
+            # bound, so neither belongs on the event loop.
+            form = CustomUserCreationForm(data)
+            if not form.is_valid():
+                errors = {
+                    field: list(messages) for field, messages in form.errors.items()
+                }
+                return None, errors
+            developer = form.save(commit=False)
+            developer.is_admin = False
+            developer.save()
+            return developer, None
+
+        developer, errors = await sync_to_async(create)()
+        if errors is not None:
+            return JsonResponse(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        preference = get_return_preference(request)
+        if preference:
+            return preferred_json_response(
+                preference,
+                developer.pk,
+                DeveloperSerializer(developer).data,
+                status=status.HTTP_201_CREATED,
+            )
+        return JsonResponse(
+            await developer_list(), safe=False, status=status.HTTP_201_CREATED
+        )
+
+    async def put(self, request, pk):
+        user = await get_user(request)
+        if not user.is_authenticated or not user.is_admin:
+            return not_authorized()
+
+        developer = await CustomUser.objects.filter(pk=pk, is_admin=False).afirst()
+        if developer is None:
+            return not_found("Developer")
+
+        serializer = DeveloperSerializer(
+            developer, data=get_data(request), partial=True
+        )
+
+        def update():
+            # The unique username/email validators query the database.
+            if serializer.is_valid():
+                serializer.save()
+                return True
+            return False
+
+        if not await sync_to_async(update)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        preference = get_return_preference(request)
+        if preference:
+            return preferred_json_response(preference, developer.pk, serializer.data)
+        return JsonResponse(await developer_list(), safe=False)
+
+
+class AsyncCollectionView(AsyncView):
+    """Async list/assign/delete of the assets or licenses of developers."""
+
+    model = None
+    serializer_class = None
+    object_kwarg = None
+    object_name = None
+
+    async def get(self, request, pk=None):
+        user = await get_user(request)
+        if not user.is_authenticated or not user.is_admin:
+            return not_authorized()
+
+        queryset = self.model.objects.all()
+        if pk:
+            queryset = queryset.filter(developer=pk)
+        queryset = queryset.order_by("pk")
+
+        paginator = KeysetPagination()
+        bounds = paginator.get_bounds(request.GET)
+        if bounds is None:
+            return JsonResponse(
+                await values_rows(self.serializer_class, queryset), safe=False
+            )
+
+        after, limit = bounds
+        rows = await fetch_rows(
+            self.serializer_class, paginator.get_page_queryset(queryset, after, limit)
+        )
+        page = paginator.get_page(rows, limit)
+        return JsonResponse(
+            paginator.get_paginated_data(serialize_rows(self.serializer_class, page))
+        )
+
+    async def post(self, request, pk):
+        user = await get_user(request)
+        if not user.is_authenticated or not user.is_admin:
+            return not_authorized()
+
+        developer = await CustomUser.objects.filter(pk=pk, is_admin=False).afirst()
+        if developer is None:
+            return not_found("Developer")
+
+        serializer = self.serializer_class(data=get_data(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        instance = await self.model.objects.acreate(
+            developer=developer, **serializer.validated_data
+        )
+        preference = get_return_preference(request)
+        if preference:
+            return preferred_json_response(
+                preference,
+                instance.pk,
+                self.serializer_class(instance).data,
+                status=status.HTTP_201_CREATED,
+            )
+        return JsonResponse(
+            await self.developer_rows(developer),
+            safe=False,
+            status=status.HTTP_201_CREATED,
+        )
+
+    async def delete(self, request, developer_id, **kwargs):
+        user = await get_user(request)
+        if not user.is_authenticated or not user.is_admin:
+            return not_authorized()
+
+        developer = await CustomUser.objects.filter(
+            pk=developer_id, is_admin=False
+        ).afirst()
+        if developer is None:
+            return not_found("Developer")
+
+        instance = await self.model.objects.filter(
+            pk=kwargs[self.object_kwarg], developer=developer
+        ).afirst()
+        if instance is None:
+            return not_found(self.object_name)
+
+        preference = get_return_preference(request)
+        if preference:
+            instance_id = instance.pk
+            deleted = self.serializer_class(instance).data
+            await instance.adelete()
+            return preferred_json_response(preference, instance_id, deleted)
+
+        await instance.adelete()
+        return JsonResponse(await self.developer_rows(developer), safe=False)
+
+    async def developer_rows(self, developer):
+        return await values_rows(
+            self.serializer_class,
+            self.model.objects.filter(developer=developer).order_by("pk"),
+        )
+
+
+class AsyncAssetsView(AsyncCollectionView):
+    model = Asset
+    serializer_class = AssetSerializer
+    object_kwarg = "asset_id"
+    object_name = "Asset"
+
+
+class AsyncLicensesView(AsyncCollectionView):
+    model = License
+    serializer_class = LicenseSerializer
+    object_kwarg = "license_id"
+    object_name = "License"
@@ -0,0 +1,131 @@
+"""
+Signed bearer tokens for API clients.
+
+A token is the user id and a fingerprint of the password hash, signed with
+a timestamp (``TimestampSigner``), so it needs no table and expires after
+``API_TOKEN_MAX_AGE`` seconds. Changing the password changes the
+fingerprint, which revokes every token issued before.
+
+When the API cache is shared by every worker process (not a LocMemCache),
+the user a token names is kept in it for ``API_TOKEN_PRINCIPAL_TIMEOUT``
+seconds and dropped from it whenever the user is saved or deleted (see
+``api.signals``), so authenticating a request normally costs no query at
+all. A per-process cache could only drop the entry of the process that saved
+the user, so there every request looks the user up instead.
+"""
+from accounts.models import CustomUser
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .cache import cache_is_shared, get_cache
+
+KEYWORD = "Bearer"
+TOKEN_SALT = "api.authentication.token"
+
+
+def get_max_age():
+    return getattr(settings, "API_TOKEN_MAX_AGE", 12 * 60 * 60)
+
+
+def get_fingerprint(user):
+    return user.get_session_auth_hash()[:16]
+
+
+def issue_token(user):
+    signer = signing.TimestampSigner(salt=TOKEN_SALT)
+    return signer.sign(f"{user.pk}.{get_fingerprint(user)}")
+
+
+def principal_key(pk):
+    return f"api:principal:{pk}"
+
+
+def invalidate_principal(pk):
+    get_cache().delete(principal_key(pk))
+
+
+def get_principal_timeout():
+    return getattr(settings, "API_TOKEN_PRINCIPAL_TIMEOUT", 300)
+
+
+def read_token(token):
+    """Return the ``(user id, fingerprint)`` of a valid, unexpired token."""
+    signer = signing.TimestampSigner(salt=TOKEN_SALT)
+    try:
+        value = signer.unsign(token, max_age=get_max_age())
+    except signing.SignatureExpired:
+        raise exceptions.AuthenticationFailed("Token expired.")
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed("Invalid token.")
+    pk, _, fingerprint = value.partition(".")
+    return int(pk), fingerprint
+
+
+def check_principal(user, fingerprint):
+    if user is None or not user.is_active:
+        raise exceptions.AuthenticationFailed("User inactive or deleted.")
+    if not constant_time_compare(get_fingerprint(user), fingerprint):
+        raise exceptions.AuthenticationFailed("Invalid token.")
+    return user
+
+
+def get_token_user(token):
+    pk, fingerprint = read_token(token)
+    if not cache_is_shared():
+        return check_principal(CustomUser.objects.filter(pk=pk).first(), fingerprint)
+
+    cache = get_cache()
+    user = cache.get(principal_key(pk))
+    if user is None:
+        user = CustomUser.objects.filter(pk=pk).first()
+        if user is not None:
+            cache.set(principal_key(pk), user, get_principal_timeout())
+    return check_principal(user, fingerprint)
+
+
+async def aget_token_user(token):
+    """``get_token_user`` for the async views."""
+    pk, fingerprint = read_token(token)
+    if not cache_is_shared():
+        user = await CustomUser.objects.filter(pk=pk).afirst()
+        return check_principal(user, fingerprint)
+
+    cache = get_cache()
+    user = await cache.aget(principal_key(pk))
+    if user is None:
+        user = await CustomUser.objects.filter(pk=pk).afirst()
+        if user is not None:
+            await cache.aset(principal_key(pk), user, get_principal_timeout())
+    return check_principal(user, fingerprint)
+
+
+def get_request_token(request):
+    """Return the bearer token of ``request``, or ``None`` if it has none."""
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != KEYWORD.lower().encode():
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed("Invalid token header.")
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed("Invalid token header.")
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    ``Authorization: Bearer <token>`` authentication with tokens from
+    ``issue_token``.
+    """
+
+    def authenticate(self, request):
+        token = get_request_token(request)
+        if token is None:
+            return None
+        return get_token_user(token), token
+
+    def authenticate_header(self, request):
+        return f'{KEYWORD} realm="api"'
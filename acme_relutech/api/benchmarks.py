@@ -0,0 +1,405 @@
+"""
+Endpoint benchmark harness used by ``manage.py bench_endpoints``.
+
+Every route of ``api/urls.py`` and ``accounts/urls.py`` has at least one
+scenario. A scenario may prepare data before each iteration (untimed) and
+then issues one request through the Django test client, which is timed
+together with its SQL query count.
+
+The benchmarks run against the configured database, so every row a run
+creates is tagged with a marker of its own (see ``create_bench``) and only
+those rows are deleted afterwards. The bench users get a random password,
+so the accounts an interrupted run leaves behind cannot be logged into.
+"""
+import itertools
+import math
+import secrets
+import statistics
+import time
+import types
+
+from accounts import urls as accounts_urls
+from accounts.models import CustomUser
+from assets.models import Asset
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from licenses.models import License
+
+from . import urls as api_urls
+from .authentication import issue_token
+from .cache import get_cache
+
+BENCH_PREFIX = "bench"
+
+
+def get_route_names():
+    """URL names of every route in ``api/urls.py`` and ``accounts/urls.py``."""
+    names = {f"api:{pattern.name}" for pattern in api_urls.urlpatterns}
+    names.update(pattern.name for pattern in accounts_urls.urlpatterns)
+    return names
+
+
+def build_urlconf(async_views):
+    """
+    Root URLconf module with the API served by the sync or the async views,
+    to compare both in one process via ``override_settings(ROOT_URLCONF=...)``.
+    """
+    module = types.ModuleType(f"bench_urls_{'async' if async_views else 'sync'}")
+    module.urlpatterns = [
+        path("accounts/", include("accounts.urls")),
+        path("api/", include((api_urls.get_urlpatterns(async_views), "api"))),
+    ]
+    return module
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``, 0 for none."""
+    ordered = sorted(values) or [0]
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def split_requests(requests, concurrency):
+    """Share ``requests`` between ``concurrency`` workers."""
+    share, extra = divmod(requests, concurrency)
+    counts = [share + (index < extra) for index in range(concurrency)]
+    return [count for count in counts if count]
+
+
+def merge_outcomes(outcomes):
+    """Merge the ``(timings, statuses)`` of concurrent workers."""
+    timings, statuses = [], set()
+    for worker_timings, worker_statuses in outcomes:
+        timings.extend(worker_timings)
+        statuses.update(worker_statuses)
+    return timings, statuses
+
+
+def summarize(timings, query_counts):
+    return {
+        "iterations": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "queries": max(query_counts),
+    }
+
+
+class Bench:
+    """Shared state of a benchmark run: clients, users and created rows."""
+
+    def __init__(self, marker, admin, password, developer):
+        self.marker = marker
+        self.admin = admin
+        self.password = password
+        self.developer = developer
+        self.client = Client(HTTP_HOST="localhost")
+        self.client.force_login(admin)
+        self.anonymous = Client(HTTP_HOST="localhost")
+        self.token_client = Client(
+            HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {issue_token(admin)}"
+        )
+        # Logged back in before every logout iteration.
+        self.logged_out = Client(HTTP_HOST="localhost")
+        self.counter = itertools.count()
+
+    def unique(self, label):
+        # The marker keeps it unique across runs; usernames allow 30 characters.
+        return f"{self.marker}-{label}-{next(self.counter)}"
+
+    def asset_item(self):
+        return {"brand": self.marker, "model": "Bench", "type": Asset.LAPTOP}
+
+    def license_item(self):
+        return {"software": self.marker}
+
+    def new_asset(self):
+        return Asset.objects.create(developer=self.developer, **self.asset_item())
+
+    def new_license(self):
+        return License.objects.create(developer=self.developer, **self.license_item())
+
+    def cleanup(self):
+        """Delete every row this run created, and nothing else."""
+        Asset.objects.filter(brand=self.marker).delete()
+        License.objects.filter(software=self.marker).delete()
+        CustomUser.objects.filter(username__startswith=f"{self.marker}-").delete()
+
+
+def create_bench():
+    """Create the admin and developer of a new run, under a fresh marker."""
+    marker = f"{BENCH_PREFIX}-{secrets.token_hex(4)}"
+    password = secrets.token_urlsafe(16)
+    admin = CustomUser.objects.create_superuser(
+        username=f"{marker}-admin", email=f"{marker}-admin@acme.com", password=password
+    )
+    developer = CustomUser.objects.create_user(
+        username=f"{marker}-developer",
+        email=f"{marker}-developer@acme.com",
+        password=password,
+    )
+    return Bench(marker, admin, password, developer)
+
+
+class Scenario:
+    """One timed request against the route named ``url_name``."""
+
+    def __init__(
+        self,
+        url_name,
+        method="get",
+        label=None,
+        kwargs=None,
+        params=None,
+        data=None,
+        content_type=None,
+        headers=None,
+        client="client",
+        prepare=None,
+    ):
+        self.url_name = url_name
+        self.method = method
+        self.label = label or f"{method.upper()} {url_name}"
+        self.kwargs = kwargs
+        self.params = params
+        self.data = data
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.client = client
+        self.prepare = prepare
+
+    def build(self, bench):
+        """Do the untimed per-iteration work and return the timed call."""
+        context = self.prepare(bench) if self.prepare else None
+        kwargs = self.kwargs(bench, context) if callable(self.kwargs) else self.kwargs
+        path = reverse(self.url_name, kwargs=kwargs)
+        data = self.data(bench, context) if callable(self.data) else self.data
+        if self.params:
+            data = self.params
+        extra = dict(self.headers)
+        if self.content_type:
+            extra["content_type"] = self.content_type
+        client = getattr(bench, self.client)
+        if client is bench.logged_out:
+            client.force_login(bench.admin)
+        request = getattr(client, self.method)
+
+        def call():
+            response = request(path, data, **extra)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            return response
+
+        return call
+
+    def run(self, bench, iterations, cold=False):
+        timings, query_counts, statuses = [], [], set()
+        for _ in range(iterations):
+            call = self.build(bench)
+            if cold:
+                get_cache().clear()
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = call()
+                timings.append(time.perf_counter() - start)
+            query_counts.append(len(context.captured_queries))
+            statuses.add(response.status_code)
+        return {
+            "route": self.url_name,
+            "status": sorted(statuses),
+            **summarize(timings, query_counts),
+        }
+
+
+def _developer_pk(bench, context):
+    return {"pk": bench.developer.pk}
+
+
+def _registration(bench, context):
+    username = bench.unique("user")
+    return {
+        "username": username,
+        "email": f"{username}@acme.com",
+        "password1": bench.password,
+        "password2": bench.password,
+    }
+
+
+def _credentials(bench, context):
+    return {"username": bench.admin.username, "password": bench.password}
+
+
+def _collection_scenarios(collection, url_prefix, new_row, item):
+    def created(bench, context):
+        return {"developer_id": bench.developer.pk, f"{collection}_id": context.pk}
+
+    def many(bench):
+        return [new_row(bench).pk for _ in range(5)]
+
+    return [
+        Scenario(f"api:all_{url_prefix}s", label=f"GET api:all_{url_prefix}s"),
+        Scenario(
+            f"api:all_{url_prefix}s",
+            label=f"GET api:all_{url_prefix}s?limit=100",
+            params={"limit": 100},
+        ),
+        Scenario(f"api:{collection}-assignments", kwargs=_developer_pk),
+        Scenario(
+            f"api:{collection}-assignments",
+            label=f"GET api:{collection}-assignments (token)",
+            kwargs=_developer_pk,
+            client="token_client",
+        ),
+        Scenario(
+            f"api:{collection}-assignments",
+            "post",
+            kwargs=_developer_pk,
+            data=lambda bench, context: item(bench),
+            content_type="application/json",
+        ),
+        Scenario(
+            f"api:{collection}-delete",
+            "delete",
+            prepare=new_row,
+            kwargs=created,
+        ),
+        Scenario(
+            f"api:{collection}-bulk-assignments",
+            "post",
+            kwargs=_developer_pk,
+            data=lambda bench, context: [item(bench)] * 5,
+            content_type="application/json",
+        ),
+        Scenario(
+            f"api:{collection}-bulk",
+            "post",
+            data=lambda bench, context: [
+                {**item(bench), "developer": bench.developer.pk}
+            ]
+            * 5,
+            content_type="application/json",
+        ),
+        Scenario(
+            f"api:{collection}-bulk",
+            "patch",
+            prepare=many,
+            data=lambda bench, context: {
+                "ids": context,
+                "developer": bench.developer.pk,
+            },
+            content_type="application/json",
+        ),
+        Scenario(
+            f"api:{collection}-bulk",
+            "delete",
+            prepare=many,
+            data=lambda bench, context: {"ids": context},
+            content_type="application/json",
+        ),
+    ]
+
+
+def get_scenarios():
+    return [
+        # api/urls.py
+        Scenario(
+            "api:login",
+            "post",
+            data=_credentials,
+            content_type="application/json",
+            client="anonymous",
+        ),
+        Scenario(
+            "api:token",
+            "post",
+            data=_credentials,
+            content_type="application/json",
+            client="anonymous",
+        ),
+        Scenario("api:api_developers"),
+        Scenario(
+            "api:api_developers",
+            label="GET api:api_developers (token)",
+            client="token_client",
+        ),
+        Scenario(
+            "api:api_developers",
+            "post",
+            data=_registration,
+            content_type="application/json",
+        ),
+        Scenario(
+            "api:api_developer_detail",
+            "put",
+            kwargs=_developer_pk,
+            data=lambda bench, context: {"email": f"{bench.unique('mail')}@acme.com"},
+            content_type="application/json",
+        ),
+        Scenario(
+            "api:inventory-export",
+            label="GET api:inventory-export ndjson",
+            kwargs={"export_format": "ndjson"},
+        ),
+        Scenario(
+            "api:inventory-export",
+            label="GET api:inventory-export csv",
+            kwargs={"export_format": "csv"},
+        ),
+        *_collection_scenarios(
+            "asset",
+            "asset",
+            lambda bench: bench.new_asset(),
+            lambda bench: bench.asset_item(),
+        ),
+        *_collection_scenarios(
+            "license",
+            "license",
+            lambda bench: bench.new_license(),
+            lambda bench: bench.license_item(),
+        ),
+        # accounts/urls.py
+        Scenario("register", client="anonymous"),
+        Scenario(
+            "register",
+            "post",
+            data=_registration,
+            client="anonymous",
+        ),
+        Scenario("login", client="anonymous"),
+        Scenario(
+            "login",
+            "post",
+            data=_credentials,
+            content_type="application/json",
+            client="anonymous",
+        ),
+        Scenario("logout", "post", client="logged_out"),
+        Scenario("dashboard"),
+        Scenario(
+            "dashboard",
+            label="GET dashboard (XHR)",
+            headers={"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"},
+        ),
+        Scenario(
+            "dashboard",
+            label="GET dashboard (XHR search)",
+            params={"q": "fleet-"},
+            headers={"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"},
+        ),
+        Scenario("create_developer"),
+        Scenario(
+            "create_developer",
+            label="GET create_developer (XHR)",
+            headers={"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"},
+        ),
+        Scenario("create_developer", "post", data=_registration),
+        Scenario(
+            "create_developer",
+            "post",
+            label="POST create_developer (XHR)",
+            data=_registration,
+            headers={"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"},
+        ),
+    ]
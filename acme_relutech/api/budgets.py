@@ -0,0 +1,35 @@
+"""
+Query budgets of the API and accounts routes, keyed by URL name.
+
+A budget is the most queries any request to the route may run with a cold
+response cache, including the session and user lookups of a logged-in
+client. ``api.testing.QueryBudgetMixin`` runs every benchmark scenario at
+several fleet sizes and fails when a route goes over its budget or its
+query count grows with the data, so raise a budget only for queries that
+stay constant.
+"""
+
+QUERY_BUDGETS = {
+    # api/urls.py
+    "api:login": 8,
+    "api:token": 1,
+    "api:api_developers": 8,
+    "api:api_developer_detail": 6,
+    "api:inventory-export": 5,
+    "api:all_assets": 4,
+    "api:asset-bulk": 7,
+    "api:asset-assignments": 5,
+    "api:asset-bulk-assignments": 6,
+    "api:asset-delete": 6,
+    "api:all_licenses": 4,
+    "api:license-bulk": 7,
+    "api:license-assignments": 5,
+    "api:license-bulk-assignments": 6,
+    "api:license-delete": 6,
+    # accounts/urls.py
+    "register": 12,
+    "login": 8,
+    "logout": 4,
+    "dashboard": 3,
+    "create_developer": 6,
+}
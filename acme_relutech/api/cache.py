@@ -0,0 +1,118 @@
+"""
+Versioned response cache for the inventory GETs.
+
+Every cached payload is keyed by the version counters of the collections it
+was built from. A counter exists per collection as a whole (``ALL``) and per
+developer, so assigning an asset to one developer leaves every other
+developer's cached list valid. Counters are bumped from model signals (see
+``api.signals``) and by the bulk endpoints, which bypass those signals.
+
+The backend is whatever ``API_CACHE_ALIAS`` points at in ``CACHES``; the
+default local-memory cache is per process, where a write handled by one
+worker would not invalidate what the others cached, so ``manage.py serve``
+turns the cache off when it runs several workers without a shared backend.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .routers import get_pin_seconds, reading_from_replica
+
+ALL = "all"
+ASSETS = "assets"
+LICENSES = "licenses"
+DEVELOPERS = "developers"
+
+_MISSING = object()
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def cache_enabled():
+    return getattr(settings, "API_CACHE_ENABLED", False)
+
+
+def cache_is_shared():
+    """Whether every worker process sees the same API cache."""
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def version_key(collection, scope):
+    return f"api:version:{collection}:{scope}"
+
+
+def get_versions(dependencies):
+    """Return the current counters of ``(collection, scope)`` pairs."""
+    cache = get_cache()
+    keys = [version_key(collection, scope) for collection, scope in dependencies]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A time based seed keeps an evicted counter from coming back at
+            # a value some stale payload was cached under.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump(collection, scopes):
+    cache = get_cache()
+    for scope in scopes:
+        key = version_key(collection, scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate(collection, developer_ids=()):
+    """
+    Bump the collection-wide counter and those of ``developer_ids``.
+
+    The bump is repeated on commit so that a reader rebuilding the payload
+    from pre-commit rows cannot leave it cached under the final version.
+    """
+    scopes = [ALL, *set(developer_ids)]
+    bump(collection, scopes)
+    transaction.on_commit(lambda: bump(collection, scopes))
+
+
+def cached_data(name, dependencies, build, params=None):
+    """
+    Return the payload built by ``build()``, from the cache when none of the
+    ``(collection, scope)`` ``dependencies`` counters moved since it was
+    stored. ``params`` are the query parameters the payload varies on.
+    """
+    if not cache_enabled():
+        return build()
+
+    cache = get_cache()
+    versions = get_versions(dependencies)
+    parts = [
+        f"{collection}.{scope}.{version}"
+        for (collection, scope), version in zip(dependencies, versions)
+    ]
+    query = urlencode(sorted(params.lists()), doseq=True) if params else ""
+    digest = hashlib.md5(query.encode()).hexdigest()
+    # Both serializer paths render the same JSON, but one must not be able to
+    # hide the other: toggling FAST_READ_SERIALIZERS rebuilds the payloads.
+    path = "fast" if getattr(settings, "FAST_READ_SERIALIZERS", False) else "model"
+    key = f"api:response:{name}:{path}:{':'.join(parts)}:{digest}"
+
+    data = cache.get(key, _MISSING)
+    if data is _MISSING:
+        data = build()
+        timeout = getattr(settings, "API_CACHE_TIMEOUT", 300)
+        if reading_from_replica():
+            # A lagging replica may have built it from rows older than the
+            # versions it is stored under.
+            timeout = min(timeout, get_pin_seconds())
+        cache.set(key, data, timeout)
+    return data
@@ -0,0 +1,69 @@
+"""
+Conditional GET support for the list endpoints.
+
+Validators come from one aggregate per source queryset (row count and latest
+``modified`` timestamp), never from the rendered body, so a matching
+``If-None-Match`` is answered with 304 before any serializer runs. The
+validators themselves are kept in the versioned response cache, so polling
+an unchanged collection costs no queries at all.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import cached_data
+
+
+def get_validators(request, querysets):
+    """
+    Return the strong ETag and the Last-Modified datetime of a GET built from
+    ``querysets``. The row count makes deletions change the ETag even though
+    they do not move the latest ``modified`` value.
+    """
+    parts = [
+        request.path,
+        urlencode(sorted(request.query_params.lists()), doseq=True),
+    ]
+    last_modified = None
+    for queryset in querysets:
+        marker = queryset.order_by().aggregate(
+            count=Count("pk"), modified=Max("modified")
+        )
+        modified = marker["modified"]
+        parts.append(f"{marker['count']}:{modified.isoformat() if modified else ''}")
+        if modified and (last_modified is None or modified > last_modified):
+            last_modified = modified
+
+    etag = quote_etag(hashlib.md5("|".join(parts).encode()).hexdigest())
+    return etag, last_modified
+
+
+def conditional_get(request, querysets, dependencies, build_response):
+    """
+    Answer 304 when ``If-None-Match`` matches the current ETag, otherwise
+    return ``build_response()``. Both carry the ETag and Last-Modified.
+    ``dependencies`` are the cache version counters of ``querysets``.
+
+    Only ``If-None-Match`` is evaluated: a deletion does not move the latest
+    ``modified`` value, so ``If-Modified-Since`` alone could miss it.
+    """
+    etag, last_modified = cached_data(
+        f"validators:{request.path}",
+        dependencies,
+        lambda: get_validators(request, querysets),
+        params=request.query_params,
+    )
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build_response()
+
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,38 @@
+"""
+Swagger overrides for the API views that do not import drf-yasg.
+
+Importing drf-yasg scans the installed distributions through pkg_resources,
+which is a large share of a cold start, and only schema generation needs
+it. ``swagger_auto_schema`` takes the keyword arguments of drf-yasg's
+decorator, plus an optional function of the ``drf_yasg.openapi`` module
+returning those that need its classes, and keeps them on the view method.
+``api.generators.SchemaGenerator`` applies drf-yasg's decorator with them the
+first time it documents the method.
+"""
+
+LAZY_ATTRIBUTE = "_lazy_swagger_auto_schema"
+
+
+def swagger_auto_schema(build=None, **overrides):
+    def decorator(view_method):
+        setattr(view_method, LAZY_ATTRIBUTE, (build, overrides))
+        return view_method
+
+    return decorator
+
+
+def resolve_swagger_auto_schema(view_method):
+    """Apply drf-yasg's decorator to ``view_method`` if it is still pending."""
+    function = getattr(view_method, "__func__", view_method)
+    lazy = function.__dict__.pop(LAZY_ATTRIBUTE, None)
+    if lazy is None:
+        return view_method
+
+    from drf_yasg import openapi
+    from drf_yasg.utils import swagger_auto_schema as apply_overrides
+
+    build, overrides = lazy
+    if build is not None:
+        overrides = {**overrides, **build(openapi)}
+    apply_overrides(**overrides)(function)
+    return view_method
@@ -0,0 +1,98 @@
+"""
+Constant-memory export of the developer/asset/license inventory.
+
+Rows are read with chunked ``QuerySet.iterator()`` calls over ``values_list``
+tuples and encoded as they arrive, so neither model instances nor the whole
+document are ever held in memory.
+"""
+import csv
+import json
+
+from accounts.models import CustomUser
+from assets.models import Asset
+from licenses.models import License
+
+CSV_COLUMNS = [
+    "record",
+    "id",
+    "developer",
+    "username",
+    "email",
+    "brand",
+    "model",
+    "type",
+    "software",
+]
+
+
+def iter_inventory_records(chunk_size=2000):
+    developers = CustomUser.objects.get_developers().order_by("pk")
+    for pk, username, email in developers.values_list(
+        "id", "username", "email"
+    ).iterator(chunk_size=chunk_size):
+        yield {"record": "developer", "id": pk, "username": username, "email": email}
+
+    assets = Asset.objects.order_by("pk").values_list(
+        "id", "developer_id", "brand", "model", "type"
+    )
+    for pk, developer, brand, model, type_ in assets.iterator(chunk_size=chunk_size):
+        yield {
+            "record": "asset",
+            "id": pk,
+            "developer": developer,
+            "brand": brand,
+            "model": model,
+            "type": type_,
+        }
+
+    licenses = License.objects.order_by("pk").values_list(
+        "id", "developer_id", "software"
+    )
+    for pk, developer, software in licenses.iterator(chunk_size=chunk_size):
+        yield {
+            "record": "license",
+            "id": pk,
+            "developer": developer,
+            "software": software,
+        }
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+class _Echo:
+    """File-like object handing each CSV line straight back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records):
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS, restval="")
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(record)
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", iter_ndjson),
+    "csv": ("text/csv", iter_csv),
+}
+
+
+def iter_export(export_format, chunk_size=2000):
+    """
+    Yield the encoded inventory in ``chunk_size``-line strings, which keeps
+    the number of writes to the socket (or file) low.
+    """
+    _, encode = EXPORT_FORMATS[export_format]
+    buffer = []
+    for line in encode(iter_inventory_records(chunk_size=chunk_size)):
+        buffer.append(line)
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,14 @@
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from .docs import resolve_swagger_auto_schema
+
+
+class SchemaGenerator(OpenAPISchemaGenerator):
+    """Resolves the overrides of ``api.docs.swagger_auto_schema``."""
+
+    def get_overrides(self, view, method):
+        action = getattr(view, "action", method.lower())
+        view_method = getattr(view, action, None)
+        if view_method is not None:
+            resolve_swagger_auto_schema(view_method)
+        return super().get_overrides(view, method)
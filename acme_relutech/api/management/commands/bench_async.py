@@ -0,0 +1,156 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.benchmarks import (
+    build_urlconf,
+    create_bench,
+    merge_outcomes,
+    percentile,
+    split_requests,
+)
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+ROUTES = {
+    "api:api_developers": lambda bench: None,
+    "api:all_assets": lambda bench: None,
+    "api:all_licenses": lambda bench: None,
+    "api:asset-assignments": lambda bench: {"pk": bench.developer.pk},
+    "api:license-assignments": lambda bench: {"pk": bench.developer.pk},
+}
+
+# (name, async views, async handler)
+MODES = [
+    ("wsgi-sync", False, False),
+    ("asgi-sync", False, True),
+    ("asgi-async", True, True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the sync views under WSGI with the sync and "
+        "the native async views under ASGI, at a given concurrency. Requests go "
+        "through Django's WSGI/ASGI handlers in process, so the numbers show "
+        "the cost of each stack, not of a particular server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--route", choices=sorted(ROUTES), default="api:all_assets")
+        parser.add_argument("--query", default="", help="e.g. limit=100")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Keep the sync views' response cache on (the async views have "
+            "none).",
+        )
+        parser.add_argument("--output", help="Write the results as JSON here.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        bench = create_bench()
+        results = []
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                API_CACHE_ENABLED=options["cache"] and settings.API_CACHE_ENABLED,
+            ):
+                for name, async_views, async_handler in MODES:
+                    with override_settings(ROOT_URLCONF=build_urlconf(async_views)):
+                        path = reverse(
+                            options["route"], kwargs=ROUTES[options["route"]](bench)
+                        )
+                        if options["query"]:
+                            path = f"{path}?{options['query']}"
+                        run = self.run_asgi if async_handler else self.run_wsgi
+                        seconds, latencies, statuses = run(
+                            path,
+                            bench.client.cookies,
+                            options["requests"],
+                            options["concurrency"],
+                        )
+                    result = {
+                        "mode": name,
+                        "requests": len(latencies),
+                        "seconds": round(seconds, 3),
+                        "requests_per_second": round(len(latencies) / seconds, 1),
+                        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                        "status": sorted(statuses),
+                    }
+                    results.append(result)
+                    self.stdout.write(
+                        f"{name:<11} {result['requests_per_second']:>8.1f} req/s  "
+                        f"p50 {result['p50_ms']:>8.2f}ms  "
+                        f"p95 {result['p95_ms']:>8.2f}ms  "
+                        f"{'/'.join(map(str, result['status']))}"
+                    )
+        finally:
+            bench.cleanup()
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(
+                    {
+                        "route": options["route"],
+                        "query": options["query"],
+                        "concurrency": options["concurrency"],
+                        "results": results,
+                    },
+                    output,
+                    indent=2,
+                )
+
+    def run_wsgi(self, path, cookies, requests, concurrency):
+        def worker(count):
+            client = Client()
+            client.cookies = cookies
+            timings, statuses = [], set()
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    timings.append(time.perf_counter() - start)
+                    statuses.add(response.status_code)
+            finally:
+                connection.close()
+            return timings, statuses
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            outcomes = list(executor.map(worker, split_requests(requests, concurrency)))
+        return time.perf_counter() - start, *merge_outcomes(outcomes)
+
+    def run_asgi(self, path, cookies, requests, concurrency):
+        async def worker(client, count):
+            timings, statuses = [], set()
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get(path)
+                timings.append(time.perf_counter() - start)
+                statuses.add(response.status_code)
+            return timings, statuses
+
+        async def main():
+            client = AsyncClient()
+            client.cookies = cookies
+            return await asyncio.gather(
+                *(
+                    worker(client, count)
+                    for count in split_requests(requests, concurrency)
+                )
+            )
+
+        start = time.perf_counter()
+        outcomes = asyncio.run(main())
+        return time.perf_counter() - start, *merge_outcomes(outcomes)
@@ -0,0 +1,118 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from accounts.models import CustomUser
+from api.benchmarks import create_bench, get_route_names, get_scenarios
+from assets.models import Asset
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from licenses.models import License
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every API and accounts route and report p50/p95 latency and "
+        "query counts, optionally as JSON to compare between commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--output", help="Write the results as JSON here.")
+        parser.add_argument(
+            "--compare", help="JSON file of an earlier run to compare against."
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Only run scenarios whose label contains this text.",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Clear the API response cache before every request.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as previous:
+                baseline = {row["label"]: row for row in json.load(previous)["results"]}
+
+        scenarios = get_scenarios()
+        missing = get_route_names() - {scenario.url_name for scenario in scenarios}
+        for name in sorted(missing):
+            self.stderr.write(self.style.WARNING(f"No scenario for route {name}."))
+        if options["only"]:
+            scenarios = [
+                scenario
+                for scenario in scenarios
+                if any(text in scenario.label for text in options["only"])
+            ]
+
+        meta = {
+            "commit": get_git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "iterations": options["iterations"],
+            "cold": options["cold"],
+            "developers": CustomUser.objects.get_developers().count(),
+            "assets": Asset.objects.count(),
+            "licenses": License.objects.count(),
+        }
+
+        bench = create_bench()
+        results = []
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"]
+            ):
+                for scenario in scenarios:
+                    result = {
+                        "label": scenario.label,
+                        **scenario.run(bench, options["iterations"], options["cold"]),
+                    }
+                    results.append(result)
+                    self.write_result(result, baseline)
+        finally:
+            bench.cleanup()
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump({"meta": meta, "results": results}, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+
+    def write_result(self, result, baseline):
+        line = (
+            f"{result['label']:<48} p50 {result['p50_ms']:>9.2f}ms "
+            f"p95 {result['p95_ms']:>9.2f}ms  {result['queries']:>4} queries  "
+            f"{'/'.join(map(str, result['status']))}"
+        )
+        previous = baseline and baseline.get(result["label"])
+        if previous:
+            change = (result["p50_ms"] - previous["p50_ms"]) / (previous["p50_ms"] or 1)
+            line += (
+                f"  p50 {change:+.0%}, "
+                f"queries {result['queries'] - previous['queries']:+d}"
+            )
+        self.stdout.write(line)
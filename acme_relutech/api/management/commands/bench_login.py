@@ -0,0 +1,91 @@
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from api.benchmarks import create_bench, percentile, split_requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+ROUTES = ["api:login", "api:token", "login"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput and latency under concurrent load, "
+        "including logins turned away with 503 by the bounded hashing pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--route", choices=ROUTES, default="api:token")
+        parser.add_argument("--requests", type=int, default=40)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--output", help="Write the results as JSON here.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        bench = create_bench()
+        path = reverse(options["route"])
+        credentials = {"username": bench.admin.username, "password": bench.password}
+
+        def worker(count):
+            client = Client()
+            timings, statuses = [], Counter()
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = client.post(
+                        path, credentials, content_type="application/json"
+                    )
+                    timings.append(time.perf_counter() - start)
+                    statuses[response.status_code] += 1
+            finally:
+                connection.close()
+            return timings, statuses
+
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                start = time.perf_counter()
+                with ThreadPoolExecutor(options["concurrency"]) as executor:
+                    outcomes = list(
+                        executor.map(
+                            worker,
+                            split_requests(options["requests"], options["concurrency"]),
+                        )
+                    )
+                seconds = time.perf_counter() - start
+        finally:
+            bench.cleanup()
+
+        timings, statuses = [], Counter()
+        for worker_timings, worker_statuses in outcomes:
+            timings.extend(worker_timings)
+            statuses.update(worker_statuses)
+        result = {
+            "route": options["route"],
+            "requests": len(timings),
+            "concurrency": options["concurrency"],
+            "hashing_concurrency": getattr(settings, "LOGIN_HASHING_CONCURRENCY", None),
+            "hash_iterations": getattr(settings, "PASSWORD_HASH_ITERATIONS", None),
+            "seconds": round(seconds, 3),
+            "logins_per_second": round(statuses[200] / seconds, 1),
+            "p50_ms": round(percentile(timings, 50) * 1000, 3),
+            "p95_ms": round(percentile(timings, 95) * 1000, 3),
+            "status": {str(code): count for code, count in sorted(statuses.items())},
+        }
+        self.stdout.write(
+            f"{options['route']}: {result['logins_per_second']:.1f} logins/s  "
+            f"p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  "
+            f"status {result['status']}"
+        )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(result, output, indent=2)
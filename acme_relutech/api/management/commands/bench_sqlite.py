@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from api.benchmarks import create_bench, percentile, split_requests
+from api.sqlite import read_pragmas
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+# SQLite's and Django's defaults: rollback journal, full sync, 2000 KiB page
+# cache, no mmap, and a new connection per request.
+DEFAULT_PROFILE = {
+    "pragmas": {
+        "journal_mode": "delete",
+        "synchronous": "full",
+        "mmap_size": 0,
+        "cache_size": -2000,
+    },
+    "conn_max_age": 0,
+}
+
+
+def run_client(path, item, cookies, write_every, count):
+    """Issue ``count`` requests, every ``write_every``-th of them a write."""
+    client = Client(raise_request_exception=False)
+    client.cookies.load(cookies)
+    reads, writes, statuses = [], [], Counter()
+    try:
+        for number in range(1, count + 1):
+            # Request boundaries, as the WSGI handler has them.
+            close_old_connections()
+            start = time.perf_counter()
+            if number % write_every:
+                response = client.get(path, {"limit": 50})
+                reads.append(time.perf_counter() - start)
+            else:
+                response = client.post(path, item, content_type="application/json")
+                writes.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+            close_old_connections()
+    finally:
+        connection.close()
+    return reads, writes, statuses
+
+
+class Command(BaseCommand):
+    help = (
+        "Run mixed read/write API traffic from concurrent worker processes, as "
+        "under a pre-forking server, with SQLite's defaults and with the "
+        "SQLITE_PRAGMAS and CONN_MAX_AGE of the settings, and compare "
+        "throughput, latency and failed requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--write-every",
+            type=int,
+            default=5,
+            help="Every Nth request of a client is a write (default 5).",
+        )
+        parser.add_argument("--output", help="Write the results as JSON here.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The default database is not SQLite.")
+        if min(options["requests"], options["concurrency"], options["write_every"]) < 1:
+            raise CommandError(
+                "--requests, --concurrency and --write-every must be positive."
+            )
+
+        profiles = [
+            ("default", DEFAULT_PROFILE),
+            (
+                "tuned",
+                {
+                    "pragmas": settings.SQLITE_PRAGMAS,
+                    "conn_max_age": settings.DATABASES["default"].get(
+                        "CONN_MAX_AGE", 0
+                    ),
+                },
+            ),
+        ]
+        bench = create_bench()
+        database = connections.settings["default"]
+        conn_max_age = database.get("CONN_MAX_AGE", 0)
+        results = []
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                API_CACHE_ENABLED=False,
+            ):
+                for name, profile in profiles:
+                    database["CONN_MAX_AGE"] = profile["conn_max_age"]
+                    with override_settings(SQLITE_PRAGMAS=profile["pragmas"]):
+                        connection.close()
+                        pragmas = read_pragmas(connection, ["journal_mode"])
+                        result = self.run(name, bench, options)
+                    result.update(
+                        journal_mode=pragmas["journal_mode"],
+                        conn_max_age=profile["conn_max_age"],
+                    )
+                    results.append(result)
+        finally:
+            database["CONN_MAX_AGE"] = conn_max_age
+            connection.close()
+            bench.cleanup()
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def run(self, name, bench, options):
+        path = reverse("api:asset-assignments", kwargs={"pk": bench.developer.pk})
+        item = bench.asset_item()
+        cookies = {key: morsel.value for key, morsel in bench.client.cookies.items()}
+        # Forked workers must not share the parent's connection.
+        connection.close()
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            options["concurrency"], mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            outcomes = list(
+                executor.map(
+                    partial(run_client, path, item, cookies, options["write_every"]),
+                    split_requests(options["requests"], options["concurrency"]),
+                )
+            )
+        seconds = time.perf_counter() - start
+
+        reads, writes, statuses = [], [], Counter()
+        for worker_reads, worker_writes, worker_statuses in outcomes:
+            reads.extend(worker_reads)
+            writes.extend(worker_writes)
+            statuses.update(worker_statuses)
+        result = {
+            "profile": name,
+            "requests": len(reads) + len(writes),
+            "concurrency": options["concurrency"],
+            "seconds": round(seconds, 3),
+            "requests_per_second": round((len(reads) + len(writes)) / seconds, 1),
+            "read_p50_ms": round(percentile(reads, 50) * 1000, 3),
+            "read_p95_ms": round(percentile(reads, 95) * 1000, 3),
+            "write_p50_ms": round(percentile(writes, 50) * 1000, 3),
+            "write_p95_ms": round(percentile(writes, 95) * 1000, 3),
+            "errors": sum(count for code, count in statuses.items() if code >= 500),
+            "status": {str(code): count for code, count in sorted(statuses.items())},
+        }
+        self.stdout.write(
+            f"{name:<8} {result['requests_per_second']:>8.1f} req/s  "
+            f"read p50 {result['read_p50_ms']:.2f}ms p95 {result['read_p95_ms']:.2f}ms  "
+            f"write p50 {result['write_p50_ms']:.2f}ms "
+            f"p95 {result['write_p95_ms']:.2f}ms  errors {result['errors']}"
+        )
+        return result
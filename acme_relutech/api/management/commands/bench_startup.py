@@ -0,0 +1,50 @@
+import json
+import statistics
+
+from api.startup import cold_start
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = ["acme_relutech.settings", "acme_relutech.settings_serverless"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time-to-first-response of cold starts: each run imports the "
+        "WSGI application in a new interpreter and serves it one request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--settings-modules", nargs="+", default=PROFILES)
+        parser.add_argument("--path", default="/api/v1/assets/")
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--output", help="Write the results as JSON here.")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be positive.")
+
+        results = []
+        for settings_module in options["settings_modules"]:
+            runs = [
+                cold_start(settings_module, options["path"])[0]
+                for _ in range(options["runs"])
+            ]
+            result = {
+                "settings": settings_module,
+                "path": options["path"],
+                "runs": len(runs),
+                "status": sorted({run["status"] for run in runs}),
+                "loaded": runs[0]["loaded"],
+            }
+            for key in ["import_ms", "first_response_ms", "process_ms"]:
+                result[key] = round(statistics.median(run[key] for run in runs), 3)
+            results.append(result)
+            self.stdout.write(
+                f"{settings_module:<36} import {result['import_ms']:>7.1f}ms  "
+                f"first response {result['first_response_ms']:>7.1f}ms  "
+                f"process {result['process_ms']:>7.1f}ms  "
+                f"{'/'.join(map(str, result['status']))}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
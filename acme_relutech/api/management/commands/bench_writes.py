@@ -0,0 +1,124 @@
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from api.benchmarks import create_bench, percentile, split_requests
+from api.writequeue import get_write_queue, reset_write_queue, run_write
+from assets.models import Asset
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = (
+        "Create assets from concurrent threads of one process, as a threaded "
+        "worker would, with each request committing on its own and with the "
+        "group-commit write queue (api/writequeue.py), and compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--orm",
+            action="store_true",
+            help="Call run_write() with Asset.objects.create() instead of "
+            "POSTing, to measure the commits without the request overhead.",
+        )
+        parser.add_argument("--output", help="Write the results as JSON here.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        bench = create_bench()
+        results = []
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                for name, enabled in [("direct", False), ("write-queue", True)]:
+                    reset_write_queue()
+                    with override_settings(API_WRITE_QUEUE=enabled):
+                        results.append(self.run(name, bench, options))
+        finally:
+            reset_write_queue()
+            bench.cleanup()
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def run(self, name, bench, options):
+        path = reverse("api:asset-assignments", kwargs={"pk": bench.developer.pk})
+        item = bench.asset_item()
+
+        def worker(count):
+            client = Client(raise_request_exception=False)
+            client.cookies = bench.client.cookies
+            timings, statuses = [], Counter()
+            try:
+                for _ in range(count):
+                    # Request boundaries, as the WSGI handler has them.
+                    close_old_connections()
+                    start = time.perf_counter()
+                    if options["orm"]:
+                        run_write(
+                            lambda: Asset.objects.create(
+                                developer=bench.developer, **item
+                            )
+                        )
+                        status = 201
+                    else:
+                        status = client.post(
+                            path,
+                            item,
+                            content_type="application/json",
+                            HTTP_PREFER="return=minimal",
+                        ).status_code
+                    timings.append(time.perf_counter() - start)
+                    statuses[status] += 1
+                    close_old_connections()
+            finally:
+                connection.close()
+            return timings, statuses
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            outcomes = list(
+                executor.map(
+                    worker, split_requests(options["requests"], options["concurrency"])
+                )
+            )
+        seconds = time.perf_counter() - start
+
+        timings, statuses = [], Counter()
+        for worker_timings, worker_statuses in outcomes:
+            timings.extend(worker_timings)
+            statuses.update(worker_statuses)
+        write_queue = get_write_queue()
+        batches = write_queue.committed_batches
+        result = {
+            "mode": name,
+            "requests": len(timings),
+            "concurrency": options["concurrency"],
+            "seconds": round(seconds, 3),
+            "writes_per_second": round(statuses[201] / seconds, 1),
+            "p50_ms": round(percentile(timings, 50) * 1000, 3),
+            "p95_ms": round(percentile(timings, 95) * 1000, 3),
+            "mean_batch": round(write_queue.committed_writes / batches, 1)
+            if batches
+            else 1,
+            "status": {str(code): count for code, count in sorted(statuses.items())},
+        }
+        self.stdout.write(
+            f"{name:<12} {result['writes_per_second']:>8.1f} writes/s  "
+            f"p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  "
+            f"mean batch {result['mean_batch']}  status {result['status']}"
+        )
+        return result
@@ -0,0 +1,26 @@
+from api.schema import generate_schema
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schema to API_SCHEMA_FILE (or --output), so it is "
+        "served without introspecting the API at runtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=getattr(settings, "API_SCHEMA_FILE", None),
+            help="Where to write the schema. Defaults to API_SCHEMA_FILE.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("Set API_SCHEMA_FILE or pass --output.")
+
+        body = generate_schema()
+        with open(options["output"], "wb") as output:
+            output.write(body)
+        self.stdout.write(f"Wrote {len(body)} bytes to {options['output']}")
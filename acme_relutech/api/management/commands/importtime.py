@@ -0,0 +1,50 @@
+import json
+import os
+
+from api.startup import cold_start, parse_importtime, summarize_imports
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the imports of a cold start (python -X importtime): load the "
+        "WSGI application in a new interpreter, serve it one request and "
+        "report the costliest packages and modules. Pass --settings to "
+        "profile another settings module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/v1/assets/")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--output", help="Write the report as JSON here.")
+
+    def handle(self, *args, **options):
+        settings_module = os.environ["DJANGO_SETTINGS_MODULE"]
+        result, stderr = cold_start(settings_module, options["path"], importtime=True)
+        report = {
+            "settings": settings_module,
+            "path": options["path"],
+            **result,
+            **summarize_imports(parse_importtime(stderr), options["top"]),
+        }
+
+        self.stdout.write(
+            f"{settings_module}: {report['modules_imported']} modules, "
+            f"{report['total_ms']:.1f}ms importing, first response "
+            f"{report['first_response_ms']:.1f}ms ({report['status']})"
+        )
+        self.stdout.write(f"loaded: {', '.join(report['loaded']) or '-'}")
+        self.stdout.write("\npackage                      self ms")
+        for row in report["packages"]:
+            self.stdout.write(f"{row['package']:<28} {row['self_ms']:>8.1f}")
+        self.stdout.write(
+            "\nmodule                                   self ms   cumul. ms"
+        )
+        for row in report["modules"]:
+            self.stdout.write(
+                f"{row['module']:<40} {row['self_ms']:>8.1f} "
+                f"{row['cumulative_ms']:>10.1f}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
@@ -0,0 +1,119 @@
+import random
+
+from accounts.models import CustomUser
+from api.cache import ASSETS, DEVELOPERS, LICENSES, invalidate
+from assets.models import Asset
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from licenses.models import License
+
+# (brand, model) pairs per asset type; a type's weight is how many of it a
+# typical developer holds.
+ASSET_CATALOG = {
+    Asset.LAPTOP: (
+        1.0,
+        [("Dell", "Latitude"), ("Apple", "MacBook Pro"), ("Lenovo", "ThinkPad")],
+    ),
+    Asset.MONITOR: (1.6, [("Dell", "U2723QE"), ("LG", "27UP850"), ("Samsung", "S80A")]),
+    Asset.KEYBOARD: (0.9, [("Logitech", "MX Keys"), ("Apple", "Magic Keyboard")]),
+    Asset.MOUSE: (0.9, [("Logitech", "MX Master 3"), ("Apple", "Magic Mouse")]),
+    Asset.HEADSET: (0.6, [("Jabra", "Evolve2 65"), ("Sony", "WH-1000XM5")]),
+}
+
+# Software and its share of all license seats.
+SOFTWARE_WEIGHTS = {
+    "Microsoft Office": 30,
+    "Slack": 25,
+    "PyCharm": 12,
+    "Zoom": 10,
+    "Adobe Acrobat": 8,
+    "GitHub Copilot": 7,
+    "Figma": 5,
+    "DataGrip": 3,
+}
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic fleet of developers, assets and licenses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--developers", type=int, default=10000)
+        parser.add_argument("--assets", type=int, default=100000)
+        parser.add_argument("--licenses", type=int, default=50000)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--prefix", default="fleet", help="Prefix of generated usernames."
+        )
+        parser.add_argument(
+            "--password",
+            default="fleetpass123",
+            help="Password shared by every generated developer.",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        prefix = options["prefix"]
+
+        # Hashing once keeps seeding fast; every developer shares the hash.
+        password = make_password(options["password"])
+        start = CustomUser.objects.filter(username__startswith=f"{prefix}-").count()
+
+        with transaction.atomic():
+            developers = CustomUser.objects.bulk_create(
+                (
+                    CustomUser(
+                        username=f"{prefix}-{number:06d}",
+                        email=f"{prefix}-{number:06d}@fleet.acme.com",
+                        password=password,
+                    )
+                    for number in range(start, start + options["developers"])
+                ),
+                batch_size=batch_size,
+            )
+            developer_ids = [developer.pk for developer in developers]
+            if not developer_ids:
+                developer_ids = list(
+                    CustomUser.objects.get_developers().values_list("pk", flat=True)
+                )
+
+            asset_types = list(ASSET_CATALOG)
+            type_weights = [ASSET_CATALOG[asset_type][0] for asset_type in asset_types]
+            assets = []
+            for _ in range(options["assets"] if developer_ids else 0):
+                asset_type = rng.choices(asset_types, type_weights)[0]
+                brand, model = rng.choice(ASSET_CATALOG[asset_type][1])
+                assets.append(
+                    Asset(
+                        brand=brand,
+                        model=model,
+                        type=asset_type,
+                        developer_id=rng.choice(developer_ids),
+                    )
+                )
+            Asset.objects.bulk_create(assets, batch_size=batch_size)
+
+            software = list(SOFTWARE_WEIGHTS)
+            software_weights = list(SOFTWARE_WEIGHTS.values())
+            licenses = [
+                License(
+                    software=rng.choices(software, software_weights)[0],
+                    developer_id=rng.choice(developer_ids),
+                )
+                for _ in range(options["licenses"] if developer_ids else 0)
+            ]
+            License.objects.bulk_create(licenses, batch_size=batch_size)
+
+            # bulk_create() sends no post_save signals.
+            invalidate(DEVELOPERS)
+            invalidate(ASSETS, developer_ids)
+            invalidate(LICENSES, developer_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(developers)} developers, {len(assets)} assets "
+                f"and {len(licenses)} licenses."
+            )
+        )
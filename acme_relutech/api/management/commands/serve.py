@@ -0,0 +1,142 @@
+import os
+
+from api.cache import cache_enabled, cache_is_shared
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+
+def get_cpu_count():
+    # The CPUs this process may run on, which a container may limit.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def get_default_workers():
+    """``WEB_CONCURRENCY`` if set, otherwise 2 * CPUs + 1."""
+    return int(os.environ.get("WEB_CONCURRENCY") or 2 * get_cpu_count() + 1)
+
+
+def get_gunicorn_config(options):
+    """Gunicorn settings for the ``serve`` options."""
+    config = {
+        "bind": options["bind"],
+        "workers": options["workers"],
+        "threads": options["threads"],
+        "worker_class": "gthread" if options["threads"] > 1 else "sync",
+        "preload_app": options["preload"],
+        "max_requests": options["max_requests"],
+        "max_requests_jitter": options["max_requests_jitter"],
+        "timeout": options["timeout"],
+        "graceful_timeout": options["graceful_timeout"],
+        "accesslog": "-" if options["access_log"] else None,
+    }
+    if options["asgi"]:
+        config["worker_class"] = "uvicorn.workers.UvicornWorker"
+    return config
+
+
+def load_application(asgi):
+    """
+    Import the WSGI or ASGI application together with the URLconf and every
+    view module, so that preloading leaves nothing for workers to import.
+    """
+    if asgi:
+        from acme_relutech.asgi import application
+    else:
+        application = import_string(settings.WSGI_APPLICATION)
+    get_resolver().url_patterns
+    # Forked workers must not share the master's database connections.
+    connections.close_all()
+    return application
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the project with gunicorn: pre-forked workers that share the "
+        "application loaded once in the master (copy-on-write), each "
+        "recycled gracefully after --max-requests requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bind", default=f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=get_default_workers(),
+            help="Defaults to WEB_CONCURRENCY, or 2 * CPUs + 1.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=1,
+            help="Threads per worker; more than 1 uses gthread workers.",
+        )
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Serve acme_relutech.asgi with uvicorn workers, for the async "
+            "views (API_ASYNC_VIEWS).",
+        )
+        parser.add_argument(
+            "--no-preload",
+            dest="preload",
+            action="store_false",
+            help="Load the application in every worker instead of the master.",
+        )
+        parser.add_argument("--max-requests", type=int, default=1000)
+        parser.add_argument(
+            "--max-requests-jitter",
+            type=int,
+            default=100,
+            help="Random extra requests per worker, so they do not all "
+            "restart at once.",
+        )
+        parser.add_argument("--timeout", type=int, default=30)
+        parser.add_argument("--graceful-timeout", type=int, default=30)
+        parser.add_argument("--access-log", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["threads"] < 1:
+            raise CommandError("--workers and --threads must be positive.")
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            raise CommandError("gunicorn is not installed, see requirements.txt.")
+        if options["asgi"]:
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                raise CommandError("--asgi needs uvicorn installed.")
+
+        config = get_gunicorn_config(options)
+        if config["workers"] > 1 and cache_enabled() and not cache_is_shared():
+            # Every worker would cache, and invalidate, on its own: a write
+            # in one would leave the others serving stale lists and ETags.
+            settings.API_CACHE_ENABLED = False
+            self.stderr.write(
+                "API cache disabled: API_CACHE_ALIAS is a per-process cache "
+                "and there is more than one worker. Point it at a shared "
+                "backend (Redis, Memcached, database, file) to keep it."
+            )
+        application = load_application(options["asgi"]) if options["preload"] else None
+
+        class Server(BaseApplication):
+            def load_config(self):
+                for key, value in config.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return application or load_application(options["asgi"])
+
+        self.stdout.write(
+            f"Serving on {config['bind']} with {config['workers']} "
+            f"{config['worker_class']} workers"
+            + (f" of {config['threads']} threads" if config["threads"] > 1 else "")
+        )
+        Server().run()
@@ -0,0 +1,91 @@
+"""
+Per-request timing collected by ``api.middleware.RequestMetricsMiddleware``.
+
+The metrics of the request being handled live in a context variable, so code
+below the view (serializers, renderers) can add to them with ``timed()``
+without being handed the request. The variable also follows async views into
+the threads that run their ORM calls, which is why queries are recorded by a
+wrapper installed on every connection rather than one entered per request.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Query count, query log and named durations (seconds) of one request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = []
+        self.db_time = 0.0
+        self.timings = {}
+
+    def add(self, name, duration):
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+
+def get_current_metrics():
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper timing the queries of the current request, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        metrics.db_time += duration
+        metrics.queries.append((sql, duration))
+
+
+def install_query_recorder(connection):
+    # execute_wrappers outlives reconnects of the same connection object.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name``."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+def timed_function(name):
+    """Decorator form of ``timed()``."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,172 @@
+"""
+Request instrumentation that is cheap enough to leave on in production.
+
+Every query of the request goes through an execute wrapper installed on each
+connection (``api.metrics.record_query``), which only takes two clock
+readings and keeps a reference to the SQL. The totals are sent back in a
+``Server-Timing`` header and logged as one JSON line on the ``api.requests``
+logger; requests over
+``REQUEST_METRICS_SLOW_MS`` or ``REQUEST_METRICS_SLOW_QUERIES`` also log
+their full query list. Streaming bodies are produced after the response
+leaves the middleware, so their generation is not part of ``total``.
+"""
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import RequestMetrics
+from .routers import RequestRouting, get_pin_cookie, get_pin_seconds, get_replicas
+
+logger = logging.getLogger("api.requests")
+
+
+def format_server_timing(metrics, total):
+    entries = [
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.query_count} queries"'
+    ]
+    entries.extend(
+        f"{name};dur={duration * 1000:.1f}"
+        for name, duration in metrics.timings.items()
+    )
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = metrics.activate()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = metrics.activate()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.start
+        response["Server-Timing"] = format_server_timing(metrics, total)
+        self.log(request, response, metrics, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # Template and DRF responses are rendered right after this hook.
+        start = time.perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: request.metrics.add("render", time.perf_counter() - start)
+        )
+        return response
+
+    def log(self, request, response, metrics, total):
+        slow_ms = getattr(settings, "REQUEST_METRICS_SLOW_MS", 500)
+        slow_queries = getattr(settings, "REQUEST_METRICS_SLOW_QUERIES", 50)
+        slow = total * 1000 >= slow_ms or metrics.query_count >= slow_queries
+        level = logging.WARNING if slow else logging.INFO
+        # Skip building the record when the logger would drop it.
+        if not logger.isEnabledFor(level):
+            return
+
+        match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": metrics.query_count,
+            "db_ms": round(metrics.db_time * 1000, 1),
+            **{
+                f"{name}_ms": round(duration * 1000, 1)
+                for name, duration in metrics.timings.items()
+            },
+            "total_ms": round(total * 1000, 1),
+        }
+        if slow:
+            record["sql"] = [
+                {"sql": sql, "ms": round(duration * 1000, 2)}
+                for sql, duration in metrics.queries
+            ]
+        logger.log(level, json.dumps(record))
+
+
+class ReplicaPinningMiddleware:
+    """
+    Routing state of the request for ``api.routers.ReplicaRouter``: reads go
+    to the primary for requests that may write, and for clients carrying the
+    pin cookie set on every response to a request that wrote.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        routing = self.get_routing(request)
+        token = routing.activate()
+        try:
+            response = self.get_response(request)
+        finally:
+            routing.deactivate(token)
+        return self.finish(routing, response)
+
+    async def __acall__(self, request):
+        routing = self.get_routing(request)
+        token = routing.activate()
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing.deactivate(token)
+        return self.finish(routing, response)
+
+    def get_routing(self, request):
+        return RequestRouting(
+            pinned=request.method not in SAFE_METHODS
+            or get_pin_cookie() in request.COOKIES
+        )
+
+    def finish(self, routing, response):
+        if routing.wrote:
+            response.set_cookie(
+                get_pin_cookie(),
+                "1",
+                max_age=get_pin_seconds(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
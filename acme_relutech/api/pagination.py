@@ -0,0 +1,107 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the primary key.
+
+    Clients opt in with ``?limit=`` and/or ``?after=<id>``. Every page is a
+    ``pk > after`` range ordered by ``pk``, so deep pages cost the same as the
+    first one. Requests without either parameter are not paginated.
+    """
+
+    after_query_param = "after"
+    limit_query_param = "limit"
+    default_limit = 100
+    max_limit = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        bounds = self.get_bounds(request.query_params)
+        if bounds is None:
+            return None
+
+        after, limit = bounds
+        return self.get_page(
+            list(self.get_page_queryset(queryset, after, limit)), limit
+        )
+
+    def get_bounds(self, params):
+        """
+        Return the ``(after, limit)`` of the requested page, or ``None`` when
+        the client did not ask for pagination.
+        """
+        if (
+            self.after_query_param not in params
+            and self.limit_query_param not in params
+        ):
+            return None
+
+        after = self.get_after(params)
+        limit = self.get_int_param(params, self.limit_query_param, minimum=1)
+        return after, min(limit or self.default_limit, self.max_limit)
+
+    def get_after(self, params):
+        return self.get_int_param(params, self.after_query_param, minimum=0)
+
+    def get_page_queryset(self, queryset, after, limit):
+        queryset = queryset.order_by("pk")
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+
+        # One extra row tells us whether another page exists.
+        return queryset[: limit + 1]
+
+    def get_page(self, rows, limit):
+        """Trim the fetched ``limit + 1`` rows to a page and set its cursor."""
+        has_next = len(rows) > limit
+        page = rows[:limit]
+        self.next_cursor = self.get_cursor(page[-1]) if has_next else None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {"results": data, "next": self.next_cursor}
+
+    def get_cursor(self, row):
+        # values_list() rows of the fast serializers lead with the primary key.
+        return row[0] if isinstance(row, tuple) else row.pk
+
+    def get_int_param(self, params, name, minimum):
+        value = params.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: ["A valid integer is required."]})
+        if value < minimum:
+            raise ValidationError(
+                {name: [f"Ensure this value is greater than or equal to {minimum}."]}
+            )
+        return value
+
+
+class UsernameKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination over users in ``username`` order, the order of the
+    partial developer index, with ``?after=<username>``.
+    """
+
+    default_limit = 50
+    max_limit = 200
+
+    def get_after(self, params):
+        return params.get(self.after_query_param) or None
+
+    def get_page_queryset(self, queryset, after, limit):
+        queryset = queryset.order_by("username")
+        if after is not None:
+            queryset = queryset.filter(username__gt=after)
+        return queryset[: limit + 1]
+
+    def get_cursor(self, row):
+        return row.username
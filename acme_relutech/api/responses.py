@@ -0,0 +1,47 @@
+from django.http import JsonResponse
+from rest_framework.response import Response
+
+RETURN_MINIMAL = "minimal"
+RETURN_REPRESENTATION = "representation"
+
+
+def get_return_preference(request):
+    """
+    Return the RFC 7240 ``return`` preference of a write request.
+
+    ``Prefer: return=minimal`` and ``Prefer: return=representation`` are
+    honoured, and ``?response=delta`` is a shortcut for the latter. ``None``
+    means the client did not ask, so the view keeps its full-list response.
+    """
+    # Plain Django requests (the async views) have no query_params.
+    params = getattr(request, "query_params", request.GET)
+    if params.get("response") == "delta":
+        return RETURN_REPRESENTATION
+
+    for preference in request.headers.get("Prefer", "").split(","):
+        name, _, value = preference.partition("=")
+        if name.strip().lower() != "return":
+            continue
+        value = value.strip().strip('"').lower()
+        if value in (RETURN_MINIMAL, RETURN_REPRESENTATION):
+            return value
+    return None
+
+
+def preferred_response(preference, pk, data=None, status=None):
+    """
+    Build the delta response of a single-object write: only the object's id
+    for ``minimal``, its serialized ``data`` for ``representation``.
+    """
+    body = {"id": pk} if preference == RETURN_MINIMAL else data
+    return Response(
+        body, status=status, headers={"Preference-Applied": f"return={preference}"}
+    )
+
+
+def preferred_json_response(preference, pk, data=None, status=200):
+    """``preferred_response`` for plain Django views."""
+    body = {"id": pk} if preference == RETURN_MINIMAL else data
+    return JsonResponse(
+        body, status=status, headers={"Preference-Applied": f"return={preference}"}
+    )
@@ -0,0 +1,74 @@
+"""
+Read replicas.
+
+``ReplicaRouter`` sends writes to ``default`` and, during a request that
+``ReplicaPinningMiddleware`` let through, reads to one of
+``DATABASE_REPLICAS``. Requests that may write (every method but GET, HEAD
+and OPTIONS) read from the primary, as does the rest of a request once it
+wrote, and every request of a client for ``DATABASE_REPLICA_PIN_SECONDS``
+after it wrote, which the middleware tracks with a cookie, so clients read
+their own writes while the replicas catch up. Outside of a request
+(management commands, the shell) everything goes to the primary.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_routing = ContextVar("api_replica_routing", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def get_pin_seconds():
+    return getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 5)
+
+
+def get_pin_cookie():
+    return getattr(settings, "DATABASE_REPLICA_PIN_COOKIE", "db_primary")
+
+
+class RequestRouting:
+    """Whether the current request reads from the primary, and if it wrote."""
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.wrote = False
+
+    def activate(self):
+        return _routing.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _routing.reset(token)
+
+
+def reading_from_replica():
+    routing = _routing.get()
+    return bool(get_replicas()) and routing is not None and not routing.pinned
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(get_replicas())
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.pinned = routing.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {"default", *get_replicas()}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive their schema from the primary.
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,99 @@
+"""
+Pre-generated OpenAPI schema.
+
+drf-yasg builds the schema by introspecting every view and serializer,
+which is too slow to repeat per request. ``manage.py generate_schema``
+writes it to ``API_SCHEMA_FILE`` at build time; ``schema_json`` serves that
+file (or, when it is missing, a schema generated once per process) from
+memory with an ETag and a long-lived Cache-Control header. The Swagger and
+ReDoc pages load their spec from it (``SPEC_URL``).
+
+drf-yasg itself is only imported to generate the schema or to build a UI
+page, so serving the file, or any other route, never loads it.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_safe
+
+
+def get_api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="ACME",
+        default_version="v1",
+        description="Acme docs EPs details.",
+    )
+
+
+def get_cache_seconds():
+    return getattr(settings, "API_SCHEMA_CACHE_SECONDS", 24 * 60 * 60)
+
+
+def generate_schema():
+    """Introspect the API and return its schema as JSON bytes."""
+    from drf_yasg.app_settings import swagger_settings
+    from drf_yasg.codecs import OpenAPICodecJson
+
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(get_api_info())
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+@lru_cache(maxsize=None)
+def get_schema():
+    """
+    Return the ``(body, etag)`` of the schema, read or generated once, or
+    ``None`` without a schema file when ``API_SCHEMA_GENERATE`` is off.
+    """
+    path = getattr(settings, "API_SCHEMA_FILE", None)
+    try:
+        with open(path, "rb") as schema_file:
+            body = schema_file.read()
+    except (TypeError, OSError):
+        if not getattr(settings, "API_SCHEMA_GENERATE", True):
+            return None
+        body = generate_schema()
+    return body, quote_etag(hashlib.md5(body).hexdigest())
+
+
+@require_safe
+def schema_json(request):
+    schema = get_schema()
+    if schema is None:
+        raise Http404("No schema file, run manage.py generate_schema.")
+    body, etag = schema
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=get_cache_seconds())
+    return response
+
+
+@lru_cache(maxsize=None)
+def get_ui_view(renderer):
+    from drf_yasg.views import get_schema_view
+    from rest_framework import permissions
+
+    schema_view = get_schema_view(
+        get_api_info(),
+        public=True,
+        permission_classes=[permissions.AllowAny],
+    )
+    return schema_view.with_ui(renderer, cache_timeout=settings.SWAGGER_CACHE_TIMEOUT)
+
+
+def schema_ui(renderer):
+    """Return a view of the drf-yasg ``renderer`` page, built on first use."""
+
+    def view(request, *args, **kwargs):
+        return get_ui_view(renderer)(request, *args, **kwargs)
+
+    return view
@@ -1,5 +1,8 @@
 from accounts.models import CustomUser
-from assets.models import Asset
+from api.metrics import timed_function
+from assets.serializers import AssetSerializer, DeveloperWithAssetsSerializer  # noqa
+from django.conf import settings
+from licenses.serializers import DeveloperWithLicensesSerializer, LicenseSerializer
 from rest_framework import serializers
 
 
@@ -9,18 +12,96 @@ class DeveloperSerializer(serializers.ModelSerializer):
         fields = ["last_login", "email", "username", "is_active"]
 
 
-class AssetSerializer(serializers.ModelSerializer):
-    developer = serializers.PrimaryKeyRelatedField(read_only=True)
+class DeveloperInventorySerializer(serializers.ModelSerializer):
+    """Developer with both assets and licenses, serialized in a single pass."""
 
-    class Meta:
-        model = Asset
-        fields = ["id", "brand", "model", "type", "developer"]
-        read_only_fields = ("developer",)
-
-
-class DeveloperWithAssetsSerializer(serializers.ModelSerializer):
     assets = AssetSerializer(many=True, read_only=True)
+    licenses = LicenseSerializer(many=True, read_only=True)
 
     class Meta:
         model = CustomUser
-        fields = ["id", "username", "email", "assets"]
+        fields = ["id", "username", "email", "assets", "licenses"]
+
+    @classmethod
+    def values_data(cls, developers):
+        """Read-only fast path, see api.values."""
+        assets = AssetSerializer.values_data_by_developer(developers)
+        licenses = LicenseSerializer.values_data_by_developer(developers)
+        return [
+            {
+                "id": pk,
+                "username": username,
+                "email": email,
+                "assets": assets[pk],
+                "licenses": licenses[pk],
+            }
+            for pk, username, email in developers.values_list("id", "username", "email")
+        ]
+
+
+def split_inventory(inventory):
+    """
+    Split merged inventory rows into the legacy ``{"assets", "licenses"}``
+    payload, where each list mirrors DeveloperWithAssetsSerializer and
+    DeveloperWithLicensesSerializer respectively.
+    """
+    assets, licenses = [], []
+    for developer in inventory:
+        identity = {
+            "id": developer["id"],
+            "username": developer["username"],
+            "email": developer["email"],
+        }
+        assets.append({**identity, "assets": developer["assets"]})
+        licenses.append({**identity, "licenses": developer["licenses"]})
+    return {"assets": assets, "licenses": licenses}
+
+
+class DeveloperInventoryResponseSerializer(serializers.Serializer):
+    """Documents the split inventory payload of DevelopersAPIView.get."""
+
+    assets = DeveloperWithAssetsSerializer(many=True)
+    licenses = DeveloperWithLicensesSerializer(many=True)
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    """Ids of a bulk request, at most ``context["max_items"]`` of them."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+
+    def validate_ids(self, ids):
+        max_items = self.context.get("max_items")
+        if max_items is not None and len(ids) > max_items:
+            raise serializers.ValidationError(f"At most {max_items} ids per request")
+        return ids
+
+
+class BulkReassignSerializer(BulkIdsSerializer):
+    developer = serializers.IntegerField(min_value=1)
+
+
+def fast_serializers_enabled():
+    return getattr(settings, "FAST_READ_SERIALIZERS", False)
+
+
+def read_only_rows(serializer_class, queryset):
+    """
+    Narrow ``queryset`` to the ``value_columns`` tuples of
+    ``serializer_class`` when the read-only fast path is enabled.
+    """
+    if fast_serializers_enabled():
+        return queryset.values_list(*serializer_class.value_columns)
+    return queryset
+
+
+@timed_function("serialize")
+def read_only_data(serializer_class, rows):
+    """
+    Serialize ``rows`` for a read-only response, through
+    ``serializer_class.values_data`` when FAST_READ_SERIALIZERS is on.
+    """
+    if fast_serializers_enabled():
+        return serializer_class.values_data(rows)
+    return serializer_class(rows, many=True).data
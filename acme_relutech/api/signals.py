@@ -0,0 +1,51 @@
+from accounts.models import CustomUser
+from assets.models import Asset
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from licenses.models import License
+
+from . import cache
+from .authentication import invalidate_principal
+from .metrics import install_query_recorder
+from .sqlite import apply_pragmas
+
+
+@receiver(post_save, sender=Asset, dispatch_uid="api_cache_asset_saved")
+@receiver(post_delete, sender=Asset, dispatch_uid="api_cache_asset_deleted")
+def invalidate_assets(sender, instance, **kwargs):
+    cache.invalidate(cache.ASSETS, [instance.developer_id])
+
+
+@receiver(post_save, sender=License, dispatch_uid="api_cache_license_saved")
+@receiver(post_delete, sender=License, dispatch_uid="api_cache_license_deleted")
+def invalidate_licenses(sender, instance, **kwargs):
+    cache.invalidate(cache.LICENSES, [instance.developer_id])
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid="api_cache_user_saved")
+@receiver(post_delete, sender=CustomUser, dispatch_uid="api_cache_user_deleted")
+def invalidate_developers(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached payload includes.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    cache.invalidate(cache.DEVELOPERS)
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid="api_principal_user_saved")
+@receiver(post_delete, sender=CustomUser, dispatch_uid="api_principal_user_deleted")
+def invalidate_token_principal(sender, instance, update_fields=None, **kwargs):
+    # A stale last_login on the cached user does not affect authentication.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_principal(instance.pk)
+
+
+@receiver(connection_created, dispatch_uid="api_metrics_connection_created")
+def record_connection_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+@receiver(connection_created, dispatch_uid="api_sqlite_connection_created")
+def configure_sqlite(sender, connection, **kwargs):
+    apply_pragmas(connection)
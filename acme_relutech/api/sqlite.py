@@ -0,0 +1,35 @@
+"""
+SQLite tuning applied to every new connection.
+
+``SQLITE_PRAGMAS`` maps pragma names to values; ``api.signals`` runs them on
+``connection_created`` for every SQLite connection, in order. WAL lets reads
+run alongside a write, ``synchronous=NORMAL`` is durable under WAL except
+for the last transactions on power loss, and ``busy_timeout`` makes a
+writer wait for the lock instead of failing with "database is locked".
+"""
+from django.conf import settings
+
+
+def get_pragmas():
+    return getattr(settings, "SQLITE_PRAGMAS", {})
+
+
+def apply_pragmas(connection, pragmas=None):
+    """
+    Run ``pragmas`` (default ``SQLITE_PRAGMAS``) on a SQLite connection,
+    straight on the driver so they are not counted as the request's queries.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = get_pragmas() if pragmas is None else pragmas
+    for name, value in pragmas.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
+
+
+def read_pragmas(connection, names):
+    """Return the current value of each pragma in ``names``."""
+    connection.ensure_connection()
+    return {
+        name: connection.connection.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in names
+    }
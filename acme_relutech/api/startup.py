@@ -0,0 +1,141 @@
+"""
+Cold start measurement used by ``manage.py importtime`` and
+``manage.py bench_startup``.
+
+``cold_start`` runs ``python -m api.startup`` in a fresh interpreter, which
+imports the WSGI application and serves it one request, the way a new
+serverless instance does. Run with ``-X importtime``, its stderr is the
+per-module import profile that ``parse_importtime`` reads. This module only
+imports the standard library, so it does not skew what it measures.
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from importlib import import_module
+
+# Modules worth knowing whether a cold start loaded.
+WATCHED_MODULES = [
+    "coreapi",
+    "django.contrib.admin",
+    "drf_yasg",
+    "pkg_resources",
+    "rest_framework",
+]
+
+
+def cold_start(
+    settings_module, path, wsgi_module="acme_relutech.wsgi", importtime=False
+):
+    """
+    Serve ``path`` from a new interpreter with ``settings_module`` and return
+    the child's measurements, the process wall time and its stderr.
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "api.startup", wsgi_module, path]
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+        "DJANGO_ALLOWED_HOSTS": "localhost",
+    }
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    process = subprocess.run(
+        command, cwd=project_dir, env=env, capture_output=True, text=True
+    )
+    process_ms = (time.perf_counter() - start) * 1000
+    if process.returncode:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["process_ms"] = round(process_ms, 3)
+    return result, process.stderr
+
+
+def parse_importtime(stderr):
+    """
+    Return ``(module, self_us, cumulative_us, depth)`` for every line of a
+    ``-X importtime`` report in ``stderr``, ignoring any other output.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((module, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def summarize_imports(rows, top=20):
+    """Total import time with the costliest packages and modules."""
+    packages = Counter()
+    for module, self_us, _, _ in rows:
+        packages[module.partition(".")[0]] += self_us
+    modules = sorted(rows, key=lambda row: row[1], reverse=True)
+    return {
+        "modules_imported": len(rows),
+        "total_ms": round(sum(packages.values()) / 1000, 3),
+        "packages": [
+            {"package": package, "self_ms": round(self_us / 1000, 3)}
+            for package, self_us in packages.most_common(top)
+        ],
+        "modules": [
+            {
+                "module": module,
+                "self_ms": round(self_us / 1000, 3),
+                "cumulative_ms": round(cumulative_us / 1000, 3),
+            }
+            for module, self_us, cumulative_us, _ in modules[:top]
+        ],
+    }
+
+
+def serve_one(wsgi_module, path):
+    start = time.perf_counter()
+    application = import_module(wsgi_module).application
+    imported = time.perf_counter()
+
+    statuses = []
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    response = application(
+        environ, lambda status, headers, exc_info=None: statuses.append(status)
+    )
+    b"".join(response)
+    response.close()
+    served = time.perf_counter()
+
+    return {
+        "status": int(statuses[0].split()[0]),
+        "import_ms": round((imported - start) * 1000, 3),
+        "first_response_ms": round((served - start) * 1000, 3),
+        "loaded": [
+            module for module in WATCHED_MODULES if sys.modules.get(module) is not None
+        ],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(serve_one(*sys.argv[1:3])))
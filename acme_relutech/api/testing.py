@@ -0,0 +1,162 @@
+"""
+Test helpers asserting that the views keep using the inventory indexes and
+stay within their query budgets, and standing in for replication.
+"""
+import io
+import os
+import re
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from .benchmarks import create_bench, get_scenarios
+from .budgets import QUERY_BUDGETS
+
+# "SCAN <table>" without "USING ... INDEX" is SQLite's plan for a full table
+# scan; index scans (e.g. over a partial index) are fine.
+FULL_SCAN = re.compile(r"^SCAN (?P<table>\w+)$")
+
+
+def get_query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanMixin:
+    """TestCase mixin running EXPLAIN QUERY PLAN on the queries of a call."""
+
+    def assertNoFullTableScans(self, func, allowed=()):
+        """
+        Run ``func()`` and fail if any SELECT it issued scans a whole table,
+        other than the tables (or aliases) listed in ``allowed``.
+        """
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT"):
+                continue
+            for detail in get_query_plan(sql):
+                match = FULL_SCAN.match(detail)
+                if match and match.group("table") not in allowed:
+                    self.fail(f"Full table scan ({detail}) in query: {sql}")
+        return result
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin running every benchmark scenario at growing fleet sizes
+    and checking its query count against ``api.budgets.QUERY_BUDGETS``.
+    """
+
+    budget_fleet_sizes = (10, 1000)
+
+    def measure_query_counts(self):
+        """
+        Return ``{label: (url name, query count)}`` for every scenario, and
+        fail if one did not succeed: the budget of an error path says nothing.
+        """
+        bench = create_bench()
+        with override_settings(ALLOWED_HOSTS=["localhost"]):
+            # Cold runs, so every count includes building the response.
+            results = [
+                {**scenario.run(bench, 1, cold=True), "label": scenario.label}
+                for scenario in get_scenarios()
+            ]
+        for result in results:
+            self.assertTrue(
+                all(200 <= code < 400 for code in result["status"]),
+                f"{result['label']} answered {result['status']}.",
+            )
+        return {
+            result["label"]: (result["route"], result["queries"]) for result in results
+        }
+
+    def assertQueryBudgets(self):
+        """
+        Fail when a route goes over its budget or its query count changes
+        between fleet sizes, i.e. scales with the data.
+        """
+        counts = {}
+        seeded = 0
+        for size in self.budget_fleet_sizes:
+            call_command(
+                "seed_fleet",
+                developers=size - seeded,
+                assets=size - seeded,
+                licenses=size - seeded,
+                stdout=io.StringIO(),
+            )
+            seeded = size
+            counts[size] = self.measure_query_counts()
+
+        smallest, *larger = self.budget_fleet_sizes
+        for label, (route, queries) in counts[smallest].items():
+            self.assertIn(route, QUERY_BUDGETS, f"No query budget for {route}.")
+            for size in larger:
+                self.assertEqual(
+                    counts[size][label][1],
+                    queries,
+                    f"{label} ran {queries} queries with {smallest} rows and "
+                    f"{counts[size][label][1]} with {size}.",
+                )
+            self.assertLessEqual(
+                queries,
+                QUERY_BUDGETS[route],
+                f"{label} is over its budget of {QUERY_BUDGETS[route]} queries.",
+            )
+
+
+class SQLiteReplicaMixin:
+    """
+    TransactionTestCase mixin adding a ``replica`` database, a SQLite file
+    listed in ``DATABASE_REPLICAS``, that only catches up with the primary
+    when the test calls ``replicate()``, so tests see replication lag.
+    """
+
+    replica_alias = "replica"
+
+    @classmethod
+    def setUpClass(cls):
+        # The alias must exist before the test case validates ``databases``.
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.settings[cls.replica_alias] = {
+            **connections.settings["default"],
+            "NAME": os.path.join(cls.replica_dir, "replica.sqlite3"),
+            "TEST": {"MIRROR": None},
+        }
+        cls.databases = {"default", cls.replica_alias}
+        cls.replica_settings = override_settings(DATABASE_REPLICAS=[cls.replica_alias])
+        cls.replica_settings.enable()
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.remove_replica()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls.remove_replica()
+
+    @classmethod
+    def remove_replica(cls):
+        cls.replica_settings.disable()
+        connections[cls.replica_alias].close()
+        del connections[cls.replica_alias]
+        del connections.settings[cls.replica_alias]
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+
+    def replicate(self):
+        """Copy the primary onto the replica with SQLite's backup API."""
+        primary, replica = connections["default"], connections[self.replica_alias]
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
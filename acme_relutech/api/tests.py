@@ -1,18 +1,66 @@
+import base64
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import types
+from concurrent.futures import Future
+from importlib import import_module
+from unittest import mock
+
 from accounts.models import CustomUser
+from api import urls as api_urls
+from api.authentication import issue_token
+from api.benchmarks import (
+    build_urlconf,
+    create_bench,
+    get_route_names,
+    get_scenarios,
+    percentile,
+)
+from api.budgets import QUERY_BUDGETS
+from api.cache import get_cache
+from api.docs import resolve_swagger_auto_schema, swagger_auto_schema
+from api.management.commands.serve import Command as ServeCommand
+from api.management.commands.serve import get_gunicorn_config
+from api.metrics import RequestMetrics
+from api.schema import get_schema
+from api.serializers import (
+    DeveloperInventoryResponseSerializer,
+    DeveloperInventorySerializer,
+    split_inventory,
+)
+from api.sqlite import read_pragmas
+from api.startup import parse_importtime, summarize_imports
+from api.testing import QueryBudgetMixin, QueryPlanMixin, SQLiteReplicaMixin
+from api.views import AssetsBulkAPIView, DevelopersAPIView
+from api.writequeue import WriteQueue, get_write_queue, reset_write_queue, run_write
+from asgiref.sync import sync_to_async
 from assets.models import Asset
 
 # from .serializers import AssetSerializer
-from assets.serializers import AssetSerializer
-from django.test import TestCase
+from assets.serializers import AssetSerializer, DeveloperWithAssetsSerializer
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import CommandError, call_command
+from django.db import connections, transaction
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from licenses.models import License
-from licenses.serializers import LicenseSerializer
+from licenses.serializers import DeveloperWithLicensesSerializer, LicenseSerializer
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from acme_relutech.imports import hide_modules
+
 
 class DeveloperAPIViewTests(TestCase):
     def setUp(self):
+        get_cache().clear()
         self.admin_user = CustomUser.objects.create_superuser(
             username="root", email="root@acme.com", password="testpass123"
         )
@@ -63,6 +111,69 @@ class DeveloperAPIViewTests(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["username"], "developer1")
 
+    def test_get_developers_inventory_single_pass(self):
+        """
+        Test that the inventory matches the per-relation serializers while
+        fetching developers only once
+        """
+        Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        License.objects.create(software="PyCharm", developer=self.user)
+        self.client.force_authenticate(user=self.admin_user)
+        # ETag aggregates for developers, assets and licenses, then the
+        # developers, their assets and their licenses
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+
+        developers = CustomUser.objects.filter(is_admin=False)
+        self.assertEqual(
+            response.data["assets"],
+            DeveloperWithAssetsSerializer(developers, many=True).data,
+        )
+        self.assertEqual(
+            response.data["licenses"],
+            DeveloperWithLicensesSerializer(developers, many=True).data,
+        )
+
+    def test_get_developers_inventory_fast_path_is_byte_identical(self):
+        """
+        Test that FAST_READ_SERIALIZERS does not change the rendered inventory
+        """
+        other = CustomUser.objects.create_user(
+            username="developer2", email="developer2@acme.com", password="testpass"
+        )
+        for developer in (self.user, other, self.user):
+            Asset.objects.create(
+                brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=developer
+            )
+            License.objects.create(software="PyCharm", developer=developer)
+        self.client.force_authenticate(user=self.admin_user)
+
+        for params in ({}, {"shape": "merged"}):
+            get_cache().clear()
+            with self.settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(self.url, params)
+            get_cache().clear()
+            with self.settings(FAST_READ_SERIALIZERS=False):
+                slow = self.client.get(self.url, params)
+            self.assertEqual(fast.content, slow.content)
+
+    def test_get_developers_inventory_merged(self):
+        """
+        Test that the merged shape returns one entry per developer
+        """
+        Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url, {"shape": "merged"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["username"], "developer1")
+        self.assertEqual(len(response.data[0]["assets"]), 1)
+        self.assertEqual(response.data[0]["licenses"], [])
+
     def test_create_developer_authenticated_admin(self):
         """
         Test that authenticated admin user can create a new developer
@@ -76,6 +187,18 @@ class DeveloperAPIViewTests(TestCase):
             CustomUser.objects.filter(email="testacmeuser@acme.com").exists()
         )
 
+    def test_create_developer_delta_response(self):
+        """
+        Test that ?response=delta returns only the created developer
+        """
+        self.client.force_login(self.admin_user)
+        response = self.client.post(
+            f"{self.url}?response=delta", self.user_data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["username"], "testacmeuser")
+        self.assertEqual(response["Preference-Applied"], "return=representation")
+
     def test_create_developer_authenticated_non_admin(self):
         """
         Test that authenticated non-admin user cannot create a new developer
@@ -124,6 +247,7 @@ class DeveloperAPIViewTests(TestCase):
 
 class AssetViewTestCase(TestCase):
     def setUp(self):
+        get_cache().clear()
         self.client = APIClient()
         self.user = CustomUser.objects.create_user(
             username="testuser",
@@ -186,6 +310,73 @@ class AssetViewTestCase(TestCase):
         self.assertEqual(response.data, serializer.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_assets_keyset_pages(self):
+        """
+        Test that assets can be walked page by page with the next cursor
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("api:all_assets")
+        response = self.client.get(url, {"limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.asset.id)
+        self.assertEqual(response.data["next"], self.asset.id)
+
+        response = self.client.get(url, {"limit": 1, "after": response.data["next"]})
+        self.assertEqual(response.data["results"][0]["id"], self.developer_asset.id)
+        self.assertIsNone(response.data["next"])
+
+    def test_get_assets_fast_path_is_byte_identical(self):
+        """
+        Test that FAST_READ_SERIALIZERS does not change the rendered assets
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        for params in ({}, {"limit": 1}):
+            get_cache().clear()
+            with self.settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(reverse("api:all_assets"), params)
+            get_cache().clear()
+            with self.settings(FAST_READ_SERIALIZERS=False):
+                slow = self.client.get(reverse("api:all_assets"), params)
+            self.assertEqual(fast.content, slow.content)
+
+    def test_cache_keyed_by_serializer_path(self):
+        """
+        Test that toggling FAST_READ_SERIALIZERS does not serve the payload
+        the other path cached.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("api:all_assets")
+        with self.settings(FAST_READ_SERIALIZERS=False):
+            self.client.get(url)
+        with self.settings(FAST_READ_SERIALIZERS=True), mock.patch.object(
+            AssetSerializer, "values_data", wraps=AssetSerializer.values_data
+        ) as values_data:
+            self.client.get(url)
+        values_data.assert_called_once()
+
+    def test_get_assets_by_developer_keyset_pages(self):
+        """
+        Test that the per-developer route only pages through that developer
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(
+            reverse("api:asset-assignments", kwargs={"pk": self.developer_user.id}),
+            {"after": 0},
+        )
+        self.assertEqual(
+            [asset["id"] for asset in response.data["results"]],
+            [self.developer_asset.id],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_get_assets_invalid_cursor(self):
+        """
+        Test that a malformed cursor is rejected
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("api:all_assets"), {"after": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_assets_unauthorized(self):
         """
         Test that unauthorized user cannot retrieve a list of assets
@@ -218,6 +409,89 @@ class AssetViewTestCase(TestCase):
         ).first()
         self.assertIsNotNone(asset)
 
+    def test_create_asset_assignment_prefer_minimal(self):
+        """
+        Test that Prefer: return=minimal only returns the new asset id.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            reverse("api:asset-assignments", kwargs={"pk": self.developer_user.id}),
+            data={"brand": "Logitech", "model": "MX", "type": Asset.MOUSE},
+            HTTP_PREFER="return=minimal",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        asset = Asset.objects.get(brand="Logitech", developer=self.developer_user)
+        self.assertEqual(response.data, {"id": asset.id})
+
+    def test_bulk_create_assets_for_developer(self):
+        """
+        Test that many assets can be assigned to one developer in one request.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        items = [
+            {"brand": "Dell", "model": "XPS", "type": Asset.LAPTOP},
+            {"brand": "Logitech", "model": "K380", "type": Asset.KEYBOARD},
+            {"brand": "Logitech", "model": "MX", "type": Asset.MOUSE},
+        ]
+        response = self.client.post(
+            reverse(
+                "api:asset-bulk-assignments", kwargs={"pk": self.developer_user.id}
+            ),
+            data=items,
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertTrue(all(asset["id"] for asset in response.data))
+        self.assertEqual(Asset.objects.filter(developer=self.developer_user).count(), 4)
+
+    def test_bulk_create_assets_for_many_developers(self):
+        """
+        Test that the global bulk route assigns each item to its developer.
+        """
+        other = CustomUser.objects.create_user(
+            username="other", email="other@acme.com", password="testpass"
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        items = [
+            {
+                "brand": "Dell",
+                "model": "XPS",
+                "type": Asset.LAPTOP,
+                "developer": developer.id,
+            }
+            for developer in (self.developer_user, other)
+        ]
+        response = self.client.post(
+            reverse("api:asset-bulk"), data=items, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [asset["developer"] for asset in response.data],
+            [self.developer_user.id, other.id],
+        )
+
+    def test_bulk_create_assets_is_all_or_nothing(self):
+        """
+        Test that one invalid item or unknown developer rejects the whole batch.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        valid = {"brand": "Dell", "model": "XPS", "type": Asset.LAPTOP}
+        response = self.client.post(
+            reverse("api:asset-bulk"),
+            data=[{**valid, "developer": self.developer_user.id}, valid],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            reverse("api:asset-bulk"),
+            data=[{**valid, "developer": 123}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Asset.objects.count(), 2)
+
     def test_create_asset_assignment_unauthorized(self):
         """
         Test that an unauthorized user cannot create an asset assignment.
@@ -282,6 +556,94 @@ class AssetViewTestCase(TestCase):
         # print("RRR: ", response.content.decode())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_bulk_delete_assets(self):
+        """
+        Test that many assets are deleted in one request and counted.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        with CaptureQueriesContext(connections["default"]) as context:
+            response = self.client.delete(
+                reverse("api:asset-bulk"),
+                data={"ids": [self.asset.id, self.developer_asset.id, 999]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"deleted": 2})
+        self.assertFalse(Asset.objects.exists())
+        # One set-based DELETE, without fetching the rows for signals.
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertEqual(
+            len([sql for sql in queries if sql.startswith('DELETE FROM "assets')]), 1
+        )
+        self.assertFalse(any('"assets_asset"."brand"' in sql for sql in queries))
+
+    def test_bulk_ids_limited_to_max_items(self):
+        """
+        Test that bulk deletes and reassignments take at most max_items ids.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        ids = [self.asset.id, self.developer_asset.id, 999]
+        with mock.patch.object(AssetsBulkAPIView, "max_items", 2):
+            response = self.client.delete(
+                reverse("api:asset-bulk"), data={"ids": ids}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ids", response.data)
+            response = self.client.patch(
+                reverse("api:asset-bulk"),
+                data={"ids": ids, "developer": self.developer_user.id},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Asset.objects.count(), 2)
+
+    def test_bulk_delete_assets_scoped_to_developer(self):
+        """
+        Test that the per-developer bulk route leaves other developers alone.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.delete(
+            reverse(
+                "api:asset-bulk-assignments", kwargs={"pk": self.developer_user.id}
+            ),
+            data={"ids": [self.asset.id, self.developer_asset.id]},
+            format="json",
+        )
+        self.assertEqual(response.data, {"deleted": 1})
+        self.assertTrue(Asset.objects.filter(pk=self.asset.id).exists())
+
+    def test_bulk_reassign_assets(self):
+        """
+        Test that assets can be moved to another developer in one request.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        other = CustomUser.objects.create_user(
+            username="other", email="other@acme.com", password="testpass"
+        )
+        response = self.client.patch(
+            reverse("api:asset-bulk"),
+            data={"ids": [self.developer_asset.id], "developer": other.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"reassigned": 1})
+        self.developer_asset.refresh_from_db()
+        self.assertEqual(self.developer_asset.developer, other)
+
+    def test_bulk_reassign_assets_to_unknown_developer(self):
+        """
+        Test that assets cannot be moved to a missing or admin user.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.patch(
+            reverse("api:asset-bulk"),
+            data={"ids": [self.developer_asset.id], "developer": self.admin_user.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.developer_asset.refresh_from_db()
+        self.assertEqual(self.developer_asset.developer, self.developer_user)
+
     def test_delete_asset_by_unauthorized_user(self):
         """
         Test that unauthorized user cannot delete an asset.
@@ -330,6 +692,7 @@ class AssetViewTestCase(TestCase):
 
 class LicenseViewTestCase(TestCase):
     def setUp(self):
+        get_cache().clear()
         self.client = APIClient()
         self.admin_user = CustomUser.objects.create_superuser(
             username="root", email="root@acme.com", password="testpass123"
@@ -371,6 +734,21 @@ class LicenseViewTestCase(TestCase):
         self.assertEqual(response.data, serializer.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_licenses_keyset_pages(self):
+        """
+        Test that licenses can be walked page by page with the next cursor
+        """
+        other = License.objects.create(software="Other License", developer=self.user)
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("api:license-assignments", kwargs={"pk": self.user.id})
+        response = self.client.get(url, {"limit": 1})
+        self.assertEqual(response.data["results"][0]["id"], self.license.id)
+        self.assertEqual(response.data["next"], self.license.id)
+
+        response = self.client.get(url, {"limit": 1, "after": response.data["next"]})
+        self.assertEqual(response.data["results"][0]["id"], other.id)
+        self.assertIsNone(response.data["next"])
+
     def test_get_licenses_unauthorized(self):
         """
         Test that unauthorized user cannot retrieve a list of licenses
@@ -394,6 +772,22 @@ class LicenseViewTestCase(TestCase):
         ).first()
         self.assertEqual(license.software, self.valid_payload["software"])
 
+    def test_bulk_create_licenses_for_developer(self):
+        """
+        Test that many licenses can be assigned to one developer in one request.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            reverse("api:license-bulk-assignments", kwargs={"pk": self.user.id}),
+            data=[{"software": "PyCharm"}, {"software": "Slack"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [license["software"] for license in response.data], ["PyCharm", "Slack"]
+        )
+        self.assertEqual(License.objects.filter(developer=self.user).count(), 3)
+
     def test_create_license_unauthorized(self):
         """
         Test that an unauthorized user cannot create a license.
@@ -441,6 +835,34 @@ class LicenseViewTestCase(TestCase):
         # print("RRR: ", response.content.decode())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_delete_license_prefer_representation(self):
+        """
+        Test that Prefer: return=representation returns the deleted license.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        expected = LicenseSerializer(self.license).data
+        response = self.client.delete(
+            reverse(
+                "api:license-delete",
+                kwargs={"developer_id": self.user.id, "license_id": self.license.id},
+            ),
+            HTTP_PREFER="return=representation",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, expected)
+        self.assertFalse(License.objects.filter(pk=expected["id"]).exists())
+
+    def test_bulk_delete_licenses_bad_request(self):
+        """
+        Test that a bulk delete without ids is rejected.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.delete(
+            reverse("api:license-bulk"), data={"ids": []}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(License.objects.filter(pk=self.license.id).exists())
+
     def test_delete_license_by_unauthorized_user(self):
         """
         Test that unauthorized user cannot delete an license.
@@ -485,3 +907,1367 @@ class LicenseViewTestCase(TestCase):
             )
         )
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class InventoryExportTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        self.asset = Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.license = License.objects.create(software="PyCharm", developer=self.user)
+
+    def test_export_ndjson(self):
+        """
+        Test that the NDJSON export streams one record per line.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(
+            reverse("api:inventory-export", kwargs={"export_format": "ndjson"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            records,
+            [
+                {
+                    "record": "developer",
+                    "id": self.user.id,
+                    "username": "developer",
+                    "email": "developer@acme.com",
+                },
+                {
+                    "record": "asset",
+                    "id": self.asset.id,
+                    "developer": self.user.id,
+                    "brand": "Dell",
+                    "model": "Latitude",
+                    "type": Asset.LAPTOP,
+                },
+                {
+                    "record": "license",
+                    "id": self.license.id,
+                    "developer": self.user.id,
+                    "software": "PyCharm",
+                },
+            ],
+        )
+
+    def test_export_csv(self):
+        """
+        Test that the CSV export has a header and one row per record.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(
+            reverse("api:inventory-export", kwargs={"export_format": "csv"})
+        )
+        rows = list(
+            csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+        )
+        self.assertEqual(
+            [row["record"] for row in rows], ["developer", "asset", "license"]
+        )
+        self.assertEqual(rows[1]["brand"], "Dell")
+
+    def test_export_unknown_format(self):
+        """
+        Test that unknown export formats return a 404 status code.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(
+            reverse("api:inventory-export", kwargs={"export_format": "xml"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_non_admin(self):
+        """
+        Test that non-admin users cannot export the inventory.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(
+            reverse("api:inventory-export", kwargs={"export_format": "csv"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_inventory_command(self):
+        """
+        Test that the management command writes the same export.
+        """
+        out = io.StringIO()
+        call_command("export_inventory", "--format", "ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.first = CustomUser.objects.create_user(
+            username="first", email="first@acme.com", password="testpass"
+        )
+        self.second = CustomUser.objects.create_user(
+            username="second", email="second@acme.com", password="testpass"
+        )
+        Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.first
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_cache_hit_skips_the_orm(self):
+        """
+        Test that a repeated inventory GET is served without queries.
+        """
+        url = reverse("api:api_developers")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first.content, second.content)
+
+    def test_write_invalidates_cached_list(self):
+        """
+        Test that assigning an asset shows up in the next GET.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.first.id})
+        self.assertEqual(len(self.client.get(url).data), 1)
+        Asset.objects.create(
+            brand="Logitech", model="MX", type=Asset.MOUSE, developer=self.first
+        )
+        self.assertEqual(len(self.client.get(url).data), 2)
+        self.assertEqual(len(self.client.get(reverse("api:all_assets")).data), 2)
+
+    def test_invalidation_is_per_developer(self):
+        """
+        Test that a write for one developer keeps other developers cached.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.second.id})
+        self.client.get(url)
+        Asset.objects.create(
+            brand="Logitech", model="MX", type=Asset.MOUSE, developer=self.first
+        )
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_bulk_writes_invalidate_cached_list(self):
+        """
+        Test that bulk endpoints, which bypass model signals, invalidate too.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.second.id})
+        self.assertEqual(self.client.get(url).data, [])
+        self.client.post(
+            reverse("api:asset-bulk-assignments", kwargs={"pk": self.second.id}),
+            data=[{"brand": "Dell", "model": "XPS", "type": Asset.LAPTOP}],
+            format="json",
+        )
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+        ids = list(Asset.objects.values_list("id", flat=True))
+        self.client.patch(
+            reverse("api:asset-bulk"),
+            data={"ids": ids, "developer": self.first.id},
+            format="json",
+        )
+        self.assertEqual(self.client.get(url).data, [])
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        self.asset = Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_list_endpoints_send_validators(self):
+        """
+        Test that every list endpoint sends an ETag and Last-Modified.
+        """
+        for name in ("api:api_developers", "api:all_assets", "api:all_licenses"):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", self.client.get(reverse("api:all_assets")))
+
+    def test_if_none_match_returns_not_modified(self):
+        """
+        Test that a matching If-None-Match returns 304 without a body.
+        """
+        url = reverse("api:all_assets")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_not_modified_skips_serializers(self):
+        """
+        Test that a 304 is computed from the aggregate alone.
+        """
+        url = reverse("api:all_assets")
+        etag = self.client.get(url)["ETag"]
+        get_cache().clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_on_update_and_delete(self):
+        """
+        Test that updates and deletions produce a new ETag.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.user.id})
+        etag = self.client.get(url)["ETag"]
+
+        self.asset.model = "Precision"
+        self.asset.save()
+        updated = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(updated["ETag"], etag)
+
+        self.asset.delete()
+        deleted = self.client.get(url, HTTP_IF_NONE_MATCH=updated["ETag"])
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+        self.assertEqual(deleted.data, [])
+
+    def test_etag_varies_with_query(self):
+        """
+        Test that different pages do not share an ETag.
+        """
+        url = reverse("api:all_assets")
+        self.assertNotEqual(
+            self.client.get(url)["ETag"], self.client.get(url, {"limit": 1})["ETag"]
+        )
+
+
+class QueryPlanTestCase(QueryPlanMixin, TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        self.asset = Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.license = License.objects.create(software="PyCharm", developer=self.user)
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_developer_routes_use_indexes(self):
+        """
+        Test that the developer inventory and updates do not scan tables.
+        """
+        url = reverse("api:api_developers")
+        for fast in (True, False):
+            get_cache().clear()
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                self.assertNoFullTableScans(lambda: self.client.get(url))
+        self.assertNoFullTableScans(
+            lambda: self.client.put(
+                reverse("api:api_developer_detail", kwargs={"pk": self.user.id}),
+                {"email": "renamed@acme.com"},
+                format="json",
+            )
+        )
+
+    def test_per_developer_routes_use_indexes(self):
+        """
+        Test that per-developer asset and license routes do not scan tables.
+        """
+        for name in ("api:asset-assignments", "api:license-assignments"):
+            url = reverse(name, kwargs={"pk": self.user.id})
+            self.assertNoFullTableScans(lambda: self.client.get(url))
+            self.assertNoFullTableScans(
+                lambda: self.client.get(url, {"after": 0, "limit": 10})
+            )
+        self.assertNoFullTableScans(
+            lambda: self.client.post(
+                reverse("api:asset-assignments", kwargs={"pk": self.user.id}),
+                {"brand": "Dell", "model": "XPS", "type": Asset.LAPTOP},
+                HTTP_PREFER="return=minimal",
+            )
+        )
+        self.assertNoFullTableScans(
+            lambda: self.client.delete(
+                reverse(
+                    "api:license-delete",
+                    kwargs={
+                        "developer_id": self.user.id,
+                        "license_id": self.license.id,
+                    },
+                )
+            )
+        )
+
+    def test_global_lists_only_scan_their_own_table(self):
+        """
+        Test that global lists only scan the table they list, in key order.
+        """
+        self.assertNoFullTableScans(
+            lambda: self.client.get(reverse("api:all_assets"), {"limit": 10}),
+            allowed={"assets_asset"},
+        )
+        self.assertNoFullTableScans(
+            lambda: self.client.get(reverse("api:all_licenses")),
+            allowed={"licenses_license"},
+        )
+
+
+class BenchmarkTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_seed_fleet(self):
+        """
+        Test that seed_fleet creates the requested rows for new developers.
+        """
+        call_command(
+            "seed_fleet",
+            developers=5,
+            assets=20,
+            licenses=10,
+            batch_size=3,
+            seed=1,
+            stdout=io.StringIO(),
+        )
+        developers = CustomUser.objects.filter(username__startswith="fleet-")
+        self.assertEqual(developers.count(), 5)
+        self.assertEqual(Asset.objects.filter(developer__in=developers).count(), 20)
+        self.assertEqual(License.objects.filter(developer__in=developers).count(), 10)
+        self.assertTrue(developers[0].check_password("fleetpass123"))
+
+        call_command(
+            "seed_fleet", developers=2, assets=0, licenses=0, stdout=io.StringIO()
+        )
+        self.assertEqual(developers.count(), 7)
+
+    def test_percentile(self):
+        """
+        Test the nearest-rank percentile used for p50/p95.
+        """
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_registration_scenarios_create_users(self):
+        """
+        Test that every scenario registering a developer creates one, with a
+        username that fits the model.
+        """
+        bench = create_bench()
+        routes = {"api:api_developers", "register", "create_developer"}
+        with override_settings(ALLOWED_HOSTS=["localhost"]):
+            for scenario in get_scenarios():
+                if scenario.method != "post" or scenario.url_name not in routes:
+                    continue
+                users = CustomUser.objects.filter(username__startswith=bench.marker)
+                before = users.count()
+                scenario.run(bench, 2)
+                self.assertEqual(users.count(), before + 2, scenario.label)
+        bench.cleanup()
+
+    def test_bench_endpoints(self):
+        """
+        Test that bench_endpoints runs every route, writes JSON results and
+        removes what it created, and only that.
+        """
+        call_command(
+            "seed_fleet", developers=3, assets=6, licenses=3, stdout=io.StringIO()
+        )
+        lookalike = CustomUser.objects.create_user(
+            username="bench-admin", email="bench@acme.com", password="testpass"
+        )
+        Asset.objects.create(
+            brand="Bench", model="Bench", type=Asset.LAPTOP, developer=lookalike
+        )
+        License.objects.create(software="Bench", developer=lookalike)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.json")
+            stderr = io.StringIO()
+            call_command(
+                "bench_endpoints",
+                iterations=2,
+                output=path,
+                stdout=io.StringIO(),
+                stderr=stderr,
+            )
+            with open(path) as output:
+                report = json.load(output)
+            call_command(
+                "bench_endpoints",
+                iterations=1,
+                only=["api:all_assets"],
+                compare=path,
+                stdout=io.StringIO(),
+            )
+
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertEqual(report["meta"]["developers"], 4)
+        self.assertEqual(report["meta"]["assets"], 7)
+        for result in report["results"]:
+            self.assertEqual(result["iterations"], 2)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertTrue(
+                all(200 <= code < 400 for code in result["status"]), result["label"]
+            )
+        self.assertEqual(
+            {result["route"] for result in report["results"]}
+            - {"register", "login", "logout", "dashboard", "create_developer"},
+            {f"api:{pattern.name}" for pattern in api_urls.urlpatterns},
+        )
+        self.assertEqual(CustomUser.objects.count(), 4)
+        self.assertEqual(Asset.objects.count(), 7)
+        self.assertEqual(License.objects.count(), 4)
+        self.assertTrue(CustomUser.objects.get(username="bench-admin").is_active)
+
+
+class RequestMetricsTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_server_timing_header(self):
+        """
+        Test that responses carry the query count and timings.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("api:all_assets"))
+        timing = response["Server-Timing"]
+        self.assertIn("db;dur=", timing)
+        self.assertIn('desc="2 queries"', timing)
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("render;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_structured_log_line(self):
+        """
+        Test that every request logs one JSON line with its metrics.
+        """
+        with self.assertLogs("api.requests", "INFO") as logs:
+            self.client.get(reverse("api:all_assets"))
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, "INFO")
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "api:all_assets")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 2)
+        self.assertNotIn("sql", record)
+        self.assertTrue(
+            {"db_ms", "serialize_ms", "render_ms", "total_ms"} <= set(record)
+        )
+
+    @override_settings(REQUEST_METRICS_SLOW_QUERIES=2)
+    def test_slow_request_logs_queries(self):
+        """
+        Test that requests over the threshold log their full query list.
+        """
+        with self.assertLogs("api.requests", "INFO") as logs:
+            self.client.get(reverse("api:all_assets"))
+        self.assertEqual(logs.records[0].levelname, "WARNING")
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(len(record["sql"]), 2)
+        self.assertIn("assets_asset", record["sql"][-1]["sql"])
+
+    def test_dropped_log_line_not_built(self):
+        """
+        Test that no record is serialized when the logger would drop it.
+        """
+        logger = logging.getLogger("api.requests")
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            with mock.patch("api.middleware.json") as middleware_json:
+                response = self.client.get(reverse("api:all_assets"))
+        finally:
+            logger.setLevel(level)
+        self.assertEqual(response.status_code, 200)
+        middleware_json.dumps.assert_not_called()
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_every_route_has_a_budget(self):
+        """
+        Test that every API and accounts route has a query budget.
+        """
+        self.assertEqual(set(QUERY_BUDGETS), get_route_names())
+
+    def test_query_counts_within_budget_and_constant(self):
+        """
+        Test that no route exceeds its budget or scales with the fleet size.
+        """
+        self.assertQueryBudgets()
+
+    def test_over_budget_fails(self):
+        """
+        Test that the harness fails a route running more than its budget.
+        """
+        self.budget_fleet_sizes = (1,)
+        with mock.patch.dict(QUERY_BUDGETS, {"api:all_assets": 1}):
+            with self.assertRaisesMessage(AssertionError, "over its budget"):
+                self.assertQueryBudgets()
+
+
+@override_settings(ROOT_URLCONF=build_urlconf(async_views=True))
+class AsyncViewsTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        self.asset = Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        Asset.objects.create(
+            brand="Dell", model="U2723QE", type=Asset.MONITOR, developer=self.user
+        )
+        self.license = License.objects.create(software="PyCharm", developer=self.user)
+        self.async_client.force_login(self.admin_user)
+        self.inventory = DeveloperInventorySerializer(
+            CustomUser.objects.get_developers()
+            .order_by("pk")
+            .prefetch_related("assets", "licenses"),
+            many=True,
+        ).data
+
+    async def test_get_developers_matches_sync_payload(self):
+        """
+        Test that the async inventory matches the serializer output.
+        """
+        response = await self.async_client.get(reverse("api:api_developers"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), split_inventory(self.inventory))
+
+        response = await self.async_client.get(
+            reverse("api:api_developers"), {"shape": "merged"}
+        )
+        self.assertEqual(response.json(), self.inventory)
+
+    async def test_get_developers_requires_admin(self):
+        """
+        Test that the async inventory keeps the 401/403 responses.
+        """
+        client = AsyncClient()
+        response = await client.get(reverse("api:api_developers"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        await sync_to_async(client.force_login)(self.user)
+        response = await client.get(reverse("api:api_developers"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_get_assets_paginated(self):
+        """
+        Test keyset pagination of the async asset list.
+        """
+        response = await self.async_client.get(reverse("api:all_assets"), {"limit": 1})
+        data = response.json()
+        self.assertEqual(data["results"], [AssetSerializer(self.asset).data])
+        self.assertEqual(data["next"], self.asset.id)
+
+        response = await self.async_client.get(
+            reverse("api:all_assets"), {"limit": "x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_post_asset(self):
+        """
+        Test that the async view assigns an asset and honours Prefer.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.user.id})
+        item = {"brand": "Apple", "model": "Magic Mouse", "type": Asset.MOUSE}
+        response = await self.async_client.post(
+            url, item, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()), 3)
+
+        response = await self.async_client.post(
+            url,
+            item,
+            content_type="application/json",
+            headers={"Prefer": "return=minimal"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Preference-Applied"], "return=minimal")
+        self.assertTrue(
+            await Asset.objects.filter(
+                pk=response.json()["id"], brand="Apple"
+            ).aexists()
+        )
+
+        response = await self.async_client.post(
+            reverse("api:asset-assignments", kwargs={"pk": self.admin_user.id}),
+            item,
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_delete_license(self):
+        """
+        Test that the async view deletes a license of a developer.
+        """
+        url = reverse(
+            "api:license-delete",
+            kwargs={"developer_id": self.user.id, "license_id": self.license.id},
+        )
+        response = await self.async_client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+        self.assertFalse(await License.objects.filter(pk=self.license.id).aexists())
+
+        response = await self.async_client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_create_and_update_developer(self):
+        """
+        Test developer creation and update through the async view.
+        """
+        response = await self.async_client.post(
+            reverse("api:api_developers"),
+            {
+                "username": "newdev",
+                "email": "newdev@acme.com",
+                "password1": "Str0ng-pass-123",
+                "password2": "Str0ng-pass-123",
+            },
+            content_type="application/json",
+            headers={"Prefer": "return=representation"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["username"], "newdev")
+        developer = await CustomUser.objects.aget(username="newdev")
+        self.assertFalse(developer.is_admin)
+
+        response = await self.async_client.put(
+            reverse("api:api_developer_detail", kwargs={"pk": developer.pk}),
+            {"email": "developer@acme.com"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.json())
+
+        response = await self.async_client.put(
+            reverse("api:api_developer_detail", kwargs={"pk": developer.pk}),
+            {"email": "renamed@acme.com"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {row["email"] for row in response.json()},
+            {"developer@acme.com", "renamed@acme.com"},
+        )
+
+    async def test_token_authentication(self):
+        """
+        Test that the async views accept bearer tokens.
+        """
+        client = AsyncClient()
+        token = await sync_to_async(issue_token)(self.admin_user)
+        response = await client.get(
+            reverse("api:all_assets"), headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+        response = await client.get(
+            reverse("api:all_assets"), headers={"Authorization": f"Bearer {token}x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["detail"], "Invalid token.")
+
+    async def test_csrf_only_for_sessions(self):
+        """
+        Test that bearer-token writes need no CSRF token, while session
+        writes still do, as on the sync views.
+        """
+        url = reverse("api:asset-assignments", kwargs={"pk": self.user.id})
+        item = {"brand": "Apple", "model": "Magic Mouse", "type": Asset.MOUSE}
+        client = AsyncClient(enforce_csrf_checks=True)
+        token = await sync_to_async(issue_token)(self.admin_user)
+        response = await client.post(
+            url,
+            item,
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        await sync_to_async(client.force_login)(self.admin_user)
+        response = await client.post(url, item, content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("CSRF Failed", response.json()["detail"])
+
+    async def test_request_metrics(self):
+        """
+        Test that queries run by async views are counted in Server-Timing.
+        """
+        response = await self.async_client.get(reverse("api:all_assets"))
+        # Session, user and the asset list.
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+
+
+class TokenAuthenticationTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.user = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.user
+        )
+        self.url = reverse("api:all_assets")
+
+    def get_token(self, username="root", password="testpass123"):
+        response = self.client.post(
+            reverse("api:token"),
+            {"username": username, "password": password},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["token_type"], "Bearer")
+        return response.data["token"]
+
+    def test_token_invalid_credentials(self):
+        """
+        Test that no token is issued for wrong credentials.
+        """
+        response = self.client.post(
+            reverse("api:token"),
+            {"username": "root", "password": "wrong"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @mock.patch("api.authentication.cache_is_shared", return_value=True)
+    def test_token_authentication_without_queries(self, cache_is_shared):
+        """
+        Test that a principal cached in a shared cache authenticates without
+        any query.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_token()}")
+        with self.assertNumQueries(3):
+            # The principal, then the validators and the list.
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("sessionid", response.cookies)
+
+    def test_principal_not_cached_per_process(self):
+        """
+        Test that a per-process cache never holds principals, so a change
+        saved by another worker applies to the next request.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_token()}")
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            # Only the principal: the list comes from the response cache.
+            self.client.get(self.url)
+        self.assertIsNone(get_cache().get(f"api:principal:{self.admin_user.pk}"))
+
+        # As a save in another process would, bypassing this one's signals.
+        CustomUser.objects.filter(pk=self.admin_user.pk).update(is_active=False)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @mock.patch("api.authentication.cache_is_shared", return_value=True)
+    def test_principal_invalidated_on_save(self, cache_is_shared):
+        """
+        Test that permission changes apply to tokens issued before them.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_token()}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.admin_user.is_admin = False
+        self.admin_user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.admin_user.is_active = False
+        self.admin_user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["detail"], "User inactive or deleted.")
+
+    def test_password_change_revokes_tokens(self):
+        """
+        Test that changing the password revokes earlier tokens.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.get_token()}")
+        self.admin_user.set_password("newpass123")
+        self.admin_user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["detail"], "Invalid token.")
+
+    def test_invalid_and_expired_tokens(self):
+        """
+        Test that tampered and expired tokens are rejected.
+        """
+        token = self.get_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}x")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["detail"], "Invalid token.")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with override_settings(API_TOKEN_MAX_AGE=-1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["detail"], "Token expired.")
+
+    def test_basic_authentication(self):
+        """
+        Test that clients using DRF's default Basic authentication still work.
+        """
+        credentials = base64.b64encode(b"root:testpass123").decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+        credentials = base64.b64encode(b"root:wrong").decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_token_for_non_admin(self):
+        """
+        Test that a developer's token authenticates but is not authorized.
+        """
+        token = self.get_token(username="developer", password="testpass")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(reverse("api:api_developers"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SchemaTestCase(TestCase):
+    def setUp(self):
+        get_schema.cache_clear()
+        self.addCleanup(get_schema.cache_clear)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "openapi.json")
+        self.url = reverse("schema-json")
+
+    def test_generate_schema_command(self):
+        """
+        Test that generate_schema writes the schema with lazy response docs.
+        """
+        call_command("generate_schema", output=self.path, stdout=io.StringIO())
+        with open(self.path) as schema_file:
+            schema = json.load(schema_file)
+        self.assertIn("/api/v1/developers/", schema["paths"])
+        response = schema["paths"]["/api/v1/developers/"]["get"]["responses"]["200"]
+        self.assertEqual(
+            response["schema"]["$ref"], "#/definitions/DeveloperInventoryResponse"
+        )
+
+    def test_schema_served_from_file_with_cache_headers(self):
+        """
+        Test that the schema file is served with an ETag and long max-age.
+        """
+        with open(self.path, "wb") as schema_file:
+            schema_file.write(b'{"swagger": "2.0"}')
+        with override_settings(API_SCHEMA_FILE=self.path, API_SCHEMA_CACHE_SECONDS=60):
+            with self.assertNumQueries(0):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, b'{"swagger": "2.0"}')
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertIn("max-age=60", response["Cache-Control"])
+            self.assertIn("public", response["Cache-Control"])
+
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_schema_generated_once_without_file(self):
+        """
+        Test that a missing schema file falls back to one in-memory generation.
+        """
+        with override_settings(API_SCHEMA_FILE=self.path), mock.patch(
+            "api.schema.generate_schema", return_value=b"{}"
+        ) as generate:
+            self.client.get(self.url)
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, b"{}")
+        generate.assert_called_once_with()
+
+    def test_missing_file_without_generation(self):
+        """
+        Test that without a schema file or generation the schema is a 404.
+        """
+        with override_settings(API_SCHEMA_FILE=self.path, API_SCHEMA_GENERATE=False):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ui_loads_static_schema(self):
+        """
+        Test that the Swagger and ReDoc pages point at the served schema.
+        """
+        for name in ["schema-swagger-ui", "schema-redoc"]:
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertContains(response, self.url)
+
+    def test_swagger_decorator_is_lazy(self):
+        """
+        Test that the developers view documents its response with a serializer
+        class instead of serializer data built at import time.
+        """
+        resolve_swagger_auto_schema(DevelopersAPIView.get)
+        overrides = DevelopersAPIView.get._swagger_auto_schema
+        self.assertIs(
+            overrides["responses"][200].schema, DeveloperInventoryResponseSerializer
+        )
+
+
+class StartupTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = os.path.join(self.directory.name, "startup.json")
+
+    def test_swagger_overrides_resolved_on_demand(self):
+        """
+        Test that swagger overrides are only built once the schema needs them.
+        """
+
+        @swagger_auto_schema(
+            lambda openapi: {"responses": {200: openapi.Response("OK")}},
+            operation_summary="Lazy",
+        )
+        def view_method(self, request):
+            pass
+
+        self.assertFalse(hasattr(view_method, "_swagger_auto_schema"))
+        resolve_swagger_auto_schema(view_method)
+        overrides = view_method._swagger_auto_schema
+        self.assertEqual(overrides["operation_summary"], "Lazy")
+        self.assertEqual(overrides["responses"][200].description, "OK")
+
+    def test_parse_importtime(self):
+        """
+        Test that the import profile is read and summarized per package.
+        """
+        stderr = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       100 |        100 |     django.utils",
+                "import time:       300 |        400 |   django",
+                '{"method": "GET"}',
+                "import time:       200 |        200 | api.views",
+            ]
+        )
+        rows = parse_importtime(stderr)
+        self.assertEqual(
+            rows,
+            [
+                ("django.utils", 100, 100, 2),
+                ("django", 300, 400, 1),
+                ("api.views", 200, 200, 0),
+            ],
+        )
+        summary = summarize_imports(rows, top=1)
+        self.assertEqual(summary["total_ms"], 0.6)
+        self.assertEqual(summary["packages"], [{"package": "django", "self_ms": 0.4}])
+        self.assertEqual(summary["modules"][0]["module"], "django")
+
+    def test_bench_startup_serverless(self):
+        """
+        Test that a serverless cold start serves its first request without
+        loading drf-yasg or pkg_resources.
+        """
+        call_command(
+            "bench_startup",
+            settings_modules=["acme_relutech.settings_serverless"],
+            runs=1,
+            output=self.output,
+            stdout=io.StringIO(),
+        )
+        with open(self.output) as output:
+            (result,) = json.load(output)
+        self.assertEqual(result["status"], [status.HTTP_403_FORBIDDEN])
+        self.assertIn("rest_framework", result["loaded"])
+        self.assertNotIn("drf_yasg", result["loaded"])
+        self.assertNotIn("pkg_resources", result["loaded"])
+        self.assertGreater(result["first_response_ms"], result["import_ms"])
+
+    def test_serverless_settings(self):
+        """
+        Test that the serverless settings leave the modules alone, turn the
+        per-process API cache off and list coreapi for the import guard.
+        """
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("acme_relutech.settings_serverless", None)
+            sys.modules.pop("coreapi", None)
+            serverless = import_module("acme_relutech.settings_serverless")
+            self.assertNotIn("coreapi", sys.modules)
+        self.assertFalse(serverless.API_CACHE_ENABLED)
+        self.assertEqual(serverless.HIDDEN_MODULES, ["coreapi"])
+
+    @override_settings(HIDDEN_MODULES=["coreapi"])
+    def test_hide_modules(self):
+        """
+        Test that the import guard hides only the listed modules.
+        """
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("coreapi", None)
+            sys.modules.pop("requests", None)
+            hide_modules()
+            with self.assertRaises(ImportError):
+                import_module("coreapi")
+            self.assertIsNotNone(import_module("requests"))
+
+    def test_importtime_report(self):
+        """
+        Test that importtime reports the costliest packages of a cold start.
+        """
+        call_command("importtime", top=5, output=self.output, stdout=io.StringIO())
+        with open(self.output) as output:
+            report = json.load(output)
+        self.assertEqual(len(report["packages"]), 5)
+        self.assertEqual(len(report["modules"]), 5)
+        self.assertIn("django", [row["package"] for row in report["packages"]])
+        self.assertGreater(report["total_ms"], 0)
+
+
+class ServeTestCase(TestCase):
+    def parse(self, *args):
+        return vars(ServeCommand().create_parser("manage.py", "serve").parse_args(args))
+
+    def test_default_config(self):
+        """
+        Test the preloaded, recycled sync workers sized from the CPU count.
+        """
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "", "PORT": "9000"}):
+            with mock.patch(
+                "api.management.commands.serve.get_cpu_count", return_value=4
+            ):
+                config = get_gunicorn_config(self.parse())
+        self.assertEqual(config["bind"], "0.0.0.0:9000")
+        self.assertEqual(config["workers"], 9)
+        self.assertEqual(config["worker_class"], "sync")
+        self.assertTrue(config["preload_app"])
+        self.assertEqual(config["max_requests"], 1000)
+        self.assertEqual(config["max_requests_jitter"], 100)
+
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "3"}):
+            config = get_gunicorn_config(self.parse("--threads", "4", "--no-preload"))
+        self.assertEqual(config["workers"], 3)
+        self.assertEqual(config["threads"], 4)
+        self.assertEqual(config["worker_class"], "gthread")
+        self.assertFalse(config["preload_app"])
+
+    def test_missing_gunicorn(self):
+        """
+        Test that serve explains a missing gunicorn instead of crashing.
+        """
+        with mock.patch.dict(sys.modules, {"gunicorn.app.base": None}):
+            with self.assertRaisesMessage(CommandError, "gunicorn is not installed"):
+                call_command("serve", stdout=io.StringIO())
+
+    def test_serve_preloads_application(self):
+        """
+        Test that the application is loaded in the master and handed to
+        gunicorn with the configuration.
+        """
+        loaded = {}
+
+        class BaseApplication:
+            def __init__(self):
+                self.cfg = mock.Mock()
+                self.load_config()
+
+            def run(self):
+                loaded["application"] = self.load()
+                loaded["config"] = dict(
+                    call.args for call in self.cfg.set.call_args_list
+                )
+
+        base = types.ModuleType("gunicorn.app.base")
+        base.BaseApplication = BaseApplication
+        with mock.patch.dict(sys.modules, {"gunicorn.app.base": base}), mock.patch(
+            "api.management.commands.serve.connections"
+        ) as connections, self.settings(API_CACHE_ENABLED=True):
+            call_command(
+                "serve", "--workers", "2", stdout=io.StringIO(), stderr=io.StringIO()
+            )
+        connections.close_all.assert_called_once_with()
+        self.assertIsInstance(loaded["application"], WSGIHandler)
+        self.assertEqual(loaded["config"]["workers"], 2)
+        self.assertTrue(loaded["config"]["preload_app"])
+
+    def test_per_process_cache_disabled_with_workers(self):
+        """
+        Test that several workers turn off a per-process API cache, while a
+        single worker or a shared backend keep it.
+        """
+        base = types.ModuleType("gunicorn.app.base")
+        base.BaseApplication = mock.Mock
+        cases = [
+            (["--workers", "2"], False, False),
+            (["--workers", "1", "--threads", "4"], False, True),
+            (["--workers", "2"], True, True),
+        ]
+        for args, shared, enabled in cases:
+            with mock.patch.dict(sys.modules, {"gunicorn.app.base": base}), mock.patch(
+                "api.management.commands.serve.cache_is_shared", return_value=shared
+            ), self.settings(API_CACHE_ENABLED=True):
+                stderr = io.StringIO()
+                call_command("serve", *args, stdout=io.StringIO(), stderr=stderr)
+                self.assertEqual(settings.API_CACHE_ENABLED, enabled, args)
+                self.assertEqual("API cache disabled" in stderr.getvalue(), not enabled)
+
+
+class SQLiteTuningTestCase(TestCase):
+    def open_connection(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        default = connections["default"]
+        settings_dict = {
+            **default.settings_dict,
+            "NAME": os.path.join(directory.name, "db.sqlite3"),
+        }
+        wrapper = type(default)(settings_dict, alias="sqlite-tuning")
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def test_pragmas_applied_to_new_connections(self):
+        """
+        Test that new SQLite connections run the SQLITE_PRAGMAS.
+        """
+        pragmas = read_pragmas(
+            self.open_connection(),
+            ["journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size"],
+        )
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": 5000,
+                "mmap_size": 256 * 1024 * 1024,
+                "cache_size": -64 * 1024,
+            },
+        )
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_sqlite_defaults_without_pragmas(self):
+        """
+        Test that an empty SQLITE_PRAGMAS leaves SQLite's defaults.
+        """
+        pragmas = read_pragmas(self.open_connection(), ["journal_mode", "synchronous"])
+        self.assertEqual(pragmas, {"journal_mode": "delete", "synchronous": 2})
+
+    def test_pragmas_not_counted_as_request_queries(self):
+        """
+        Test that a connection opened during a request does not add its
+        pragmas to the request's query count.
+        """
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        try:
+            wrapper = self.open_connection()
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            metrics.deactivate(token)
+        self.assertEqual(metrics.query_count, 1)
+
+
+class WriteQueueTestCase(TransactionTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.addCleanup(reset_write_queue)
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.developer = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+
+    def create_asset(self, model="Latitude"):
+        return Asset.objects.create(
+            brand="Dell", model=model, type=Asset.LAPTOP, developer=self.developer
+        )
+
+    def test_concurrent_writes_commit_together(self):
+        """
+        Test that queued writes commit in one batch, each caller getting its
+        own result, and that a failing write only rolls back itself.
+        """
+        write_queue = WriteQueue(max_batch=10, max_delay=0.05)
+        self.addCleanup(write_queue.stop)
+
+        def fail():
+            self.create_asset("Rolled back")
+            raise ValueError("invalid")
+
+        futures = []
+        for function in [self.create_asset, fail, self.create_asset]:
+            future = Future()
+            write_queue.pending.put((function, future))
+            futures.append(future)
+        write_queue.start()
+
+        first, failed, last = futures
+        self.assertEqual(first.result(5).model, "Latitude")
+        self.assertIsInstance(last.result(5), Asset)
+        with self.assertRaisesMessage(ValueError, "invalid"):
+            failed.result(5)
+        self.assertEqual(write_queue.committed_batches, 1)
+        self.assertEqual(write_queue.committed_writes, 3)
+        self.assertEqual(
+            sorted(Asset.objects.values_list("pk", flat=True)),
+            sorted([first.result().pk, last.result().pk]),
+        )
+
+    @override_settings(API_WRITE_QUEUE=True)
+    def test_post_through_write_queue(self):
+        """
+        Test that asset creation goes through the writer when enabled, while
+        validation errors are answered without it.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        url = reverse("api:asset-assignments", kwargs={"pk": self.developer.pk})
+
+        response = client.post(
+            url,
+            {"brand": "Dell", "model": "Latitude", "type": Asset.LAPTOP},
+            format="json",
+            HTTP_PREFER="return=representation",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Asset.objects.filter(pk=response.data["id"]).exists())
+
+        response = client.post(url, {"brand": "Dell"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_write_queue().committed_writes, 1)
+
+    @override_settings(API_WRITE_QUEUE=True)
+    def test_write_inside_transaction_runs_directly(self):
+        """
+        Test that a write inside a transaction stays part of it.
+        """
+        with transaction.atomic():
+            asset = run_write(self.create_asset)
+            transaction.set_rollback(True)
+        self.assertFalse(Asset.objects.filter(pk=asset.pk).exists())
+        self.assertEqual(get_write_queue().committed_writes, 0)
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class ReplicaRoutingTestCase(SQLiteReplicaMixin, TransactionTestCase):
+    def setUp(self):
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="root", email="root@acme.com", password="testpass123"
+        )
+        self.developer = CustomUser.objects.create_user(
+            username="developer", email="developer@acme.com", password="testpass"
+        )
+        self.replicate()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse("api:asset-assignments", kwargs={"pk": self.developer.pk})
+
+    def create_asset(self):
+        return Asset.objects.create(
+            brand="Dell", model="Latitude", type=Asset.LAPTOP, developer=self.developer
+        )
+
+    def test_reads_go_to_replica(self):
+        """
+        Test that reads see the replica, lag included, and that code outside
+        of a request reads from the primary.
+        """
+        self.create_asset()
+        self.assertEqual(Asset.objects.count(), 1)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+        self.replicate()
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+        self.assertNotIn(settings.DATABASE_REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_client_reads_own_writes(self):
+        """
+        Test that a write pins its client to the primary with a cookie, and
+        that reads go back to the replica once the cookie is gone.
+        """
+        response = self.client.post(
+            self.url,
+            {"brand": "Dell", "model": "Latitude", "type": Asset.LAPTOP},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        cookie = response.cookies[settings.DATABASE_REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.DATABASE_REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie["httponly"])
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+
+        del self.client.cookies[settings.DATABASE_REPLICA_PIN_COOKIE]
+        response = self.client.get(self.url)
+        self.assertEqual(response.data, [])
+
+    @override_settings(API_CACHE_ENABLED=True, API_CACHE_TIMEOUT=300)
+    def test_replica_responses_cached_briefly(self):
+        """
+        Test that data built from a replica is cached no longer than the pin.
+        """
+        get_cache().clear()
+        with mock.patch.object(get_cache(), "set") as cache_set:
+            self.client.get(self.url)
+        timeouts = [call.args[2] for call in cache_set.call_args_list]
+        self.assertTrue(timeouts)
+        self.assertLessEqual(max(timeouts), settings.DATABASE_REPLICA_PIN_SECONDS)
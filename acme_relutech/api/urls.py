@@ -1,35 +1,77 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
-from .views import AssetsAPIView, LicensesAPIView, UserLoginAPIView
+from . import async_views, views
+from .views import (
+    AssetsBulkAPIView,
+    InventoryExportAPIView,
+    LicensesBulkAPIView,
+    TokenAPIView,
+    UserLoginAPIView,
+)
 
 app_name = "api"
 
-urlpatterns = [
-    # users
-    path("v1/user/login/", UserLoginAPIView.as_view(), name="login"),
-    path("v1/developers/", views.DevelopersAPIView.as_view(), name="api_developers"),
-    path(
-        "v1/developers/<int:pk>/",
-        views.DevelopersAPIView.as_view(),
-        name="api_developer_detail",
-    ),
-    # Assets
-    path("v1/assets/", AssetsAPIView.as_view(), name="all_assets"),
-    path("v1/assets/<int:pk>/", AssetsAPIView.as_view(), name="asset-assignments"),
-    path(
-        "v1/assets/<int:developer_id>/<int:asset_id>/",
-        AssetsAPIView.as_view(),
-        name="asset-delete",
-    ),
-    # Licenses
-    path("v1/licenses/", LicensesAPIView.as_view(), name="all_licenses"),
-    path(
-        "v1/licenses/<int:pk>/", LicensesAPIView.as_view(), name="license-assignments"
-    ),
-    path(
-        "v1/licenses/<int:developer_id>/<int:license_id>/",
-        LicensesAPIView.as_view(),
-        name="license-delete",
-    ),
-]
+
+def get_urlpatterns(async_views_enabled=False):
+    """
+    Build the API routes, with the developer, asset and license endpoints
+    served by the async views of ``api.async_views`` when
+    ``async_views_enabled``.
+    """
+    if async_views_enabled:
+        developers_view = async_views.AsyncDevelopersView.as_view()
+        assets_view = async_views.AsyncAssetsView.as_view()
+        licenses_view = async_views.AsyncLicensesView.as_view()
+    else:
+        developers_view = views.DevelopersAPIView.as_view()
+        assets_view = views.AssetsAPIView.as_view()
+        licenses_view = views.LicensesAPIView.as_view()
+
+    return [
+        # users
+        path("v1/user/login/", UserLoginAPIView.as_view(), name="login"),
+        path("v1/user/token/", TokenAPIView.as_view(), name="token"),
+        path("v1/developers/", developers_view, name="api_developers"),
+        path(
+            "v1/developers/<int:pk>/",
+            developers_view,
+            name="api_developer_detail",
+        ),
+        path(
+            "v1/export/<str:export_format>/",
+            InventoryExportAPIView.as_view(),
+            name="inventory-export",
+        ),
+        # Assets
+        path("v1/assets/", assets_view, name="all_assets"),
+        path("v1/assets/bulk/", AssetsBulkAPIView.as_view(), name="asset-bulk"),
+        path("v1/assets/<int:pk>/", assets_view, name="asset-assignments"),
+        path(
+            "v1/assets/<int:pk>/bulk/",
+            AssetsBulkAPIView.as_view(),
+            name="asset-bulk-assignments",
+        ),
+        path(
+            "v1/assets/<int:developer_id>/<int:asset_id>/",
+            assets_view,
+            name="asset-delete",
+        ),
+        # Licenses
+        path("v1/licenses/", licenses_view, name="all_licenses"),
+        path("v1/licenses/bulk/", LicensesBulkAPIView.as_view(), name="license-bulk"),
+        path("v1/licenses/<int:pk>/", licenses_view, name="license-assignments"),
+        path(
+            "v1/licenses/<int:pk>/bulk/",
+            LicensesBulkAPIView.as_view(),
+            name="license-bulk-assignments",
+        ),
+        path(
+            "v1/licenses/<int:developer_id>/<int:license_id>/",
+            licenses_view,
+            name="license-delete",
+        ),
+    ]
+
+
+urlpatterns = get_urlpatterns(getattr(settings, "API_ASYNC_VIEWS", False))
@@ -0,0 +1,43 @@
+"""
+Read-only fast path shared by the inventory serializers.
+
+``ValuesSerializerMixin`` builds the output of a flat ModelSerializer
+straight from ``values_list()`` tuples, without instantiating models or
+dispatching per field. Serializers using it list the ``value_columns`` to
+fetch, one per ``Meta.fields`` entry and in the same order; the views only
+take this path when ``FAST_READ_SERIALIZERS`` is on.
+"""
+from collections import defaultdict
+
+from django.db.models import QuerySet
+
+
+class ValuesSerializerMixin:
+    value_columns = ()
+
+    @classmethod
+    def values_data(cls, rows):
+        """
+        Build the same output as ``cls(rows, many=True).data`` from
+        ``values_list`` tuples. ``rows`` is a queryset or already fetched
+        ``value_columns`` tuples.
+        """
+        if isinstance(rows, QuerySet):
+            # Covering indexes could otherwise hand values_list() rows back
+            # in a different order than a model query over the same filter.
+            if not rows.ordered:
+                rows = rows.order_by("pk")
+            rows = rows.values_list(*cls.value_columns)
+        fields = cls.Meta.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+    @classmethod
+    def values_data_by_developer(cls, developers):
+        """Fast-path rows of ``developers`` grouped by developer id."""
+        rows = cls.Meta.model.objects.filter(
+            developer__in=developers.values("pk")
+        ).order_by("developer", "pk")
+        grouped = defaultdict(list)
+        for row in cls.values_data(rows):
+            grouped[row["developer"]].append(row)
+        return grouped
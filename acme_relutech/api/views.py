@@ -1,15 +1,35 @@
 from accounts.forms import CustomUserCreationForm
 from accounts.models import CustomUser
 from accounts.serializers import DeveloperSerializer, SwaggDeveloperSerializer
+from api.authentication import get_max_age, issue_token
+from api.cache import ALL, ASSETS, DEVELOPERS, LICENSES, cached_data, invalidate
+from api.conditional import conditional_get
+from api.docs import swagger_auto_schema
+from api.export import EXPORT_FORMATS, iter_export
+from api.metrics import timed_function
+from api.pagination import KeysetPagination
+from api.responses import get_return_preference, preferred_response
+from api.serializers import (
+    BulkIdsSerializer,
+    BulkReassignSerializer,
+    DeveloperInventoryResponseSerializer,
+    DeveloperInventorySerializer,
+    fast_serializers_enabled,
+    read_only_data,
+    read_only_rows,
+    split_inventory,
+)
+from api.writequeue import run_write
 from assets.models import Asset
 
 # from .serializers import AssetSerializer, DeveloperWithAssetsSerializer
-from assets.serializers import AssetSerializer, DeveloperWithAssetsSerializer
+from assets.serializers import AssetSerializer
 from django.contrib.auth import authenticate, login
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from licenses.models import License
-from licenses.serializers import DeveloperWithLicensesSerializer, LicenseSerializer
+from licenses.serializers import LicenseSerializer
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -33,31 +53,52 @@ class UserLoginAPIView(APIView):
         return Response({"success": True})
 
 
+class TokenAPIView(APIView):
+    # Credentials come in the body; no session or CSRF check applies.
+    authentication_classes = []
+
+    def post(self, request, format=None):
+        username = request.data.get("username")
+        password = request.data.get("password")
+
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            return Response(
+                {"error": "Invalid username or password"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "token": issue_token(user),
+                "token_type": "Bearer",
+                "expires_in": get_max_age(),
+            }
+        )
+
+
 class DevelopersAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_summary="Get developers, their assets and licenses",
-        responses={
-            200: openapi.Response(
-                description="OK",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        "assets": openapi.Schema(
-                            type=openapi.TYPE_ARRAY,
-                            items=DeveloperWithAssetsSerializer().data,
-                        ),
-                        "licenses": openapi.Schema(
-                            type=openapi.TYPE_ARRAY,
-                            items=DeveloperWithLicensesSerializer().data,
-                        ),
-                    },
+        lambda openapi: {
+            "manual_parameters": [
+                openapi.Parameter(
+                    "shape",
+                    openapi.IN_QUERY,
+                    type=openapi.TYPE_STRING,
+                    enum=["split", "merged"],
+                    description="'merged' returns one entry per developer holding "
+                    "both assets and licenses instead of two parallel lists.",
                 ),
-            ),
-            401: "Unauthorized",
-            403: "Forbidden",
+            ],
+            "responses": {
+                200: openapi.Response("OK", DeveloperInventoryResponseSerializer),
+                401: "Unauthorized",
+                403: "Forbidden",
+            },
         },
+        operation_summary="Get developers, their assets and licenses",
     )
     def get(self, request):
         if not request.user.is_authenticated:
@@ -66,19 +107,34 @@ class DevelopersAPIView(APIView):
         if not request.user.is_admin:
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        developers_asset = CustomUser.objects.filter(is_admin=False).prefetch_related(
-            "assets"
-        )
-        developers_licenses = CustomUser.objects.filter(
-            is_admin=False
-        ).prefetch_related("licenses")
-        asset_serializer = DeveloperWithAssetsSerializer(developers_asset, many=True)
-        license_serializer = DeveloperWithLicensesSerializer(
-            developers_licenses, many=True
+        dependencies = [(DEVELOPERS, ALL), (ASSETS, ALL), (LICENSES, ALL)]
+        return conditional_get(
+            request,
+            [
+                CustomUser.objects.get_developers(),
+                Asset.objects.all(),
+                License.objects.all(),
+            ],
+            dependencies,
+            lambda: self.inventory_response(request, dependencies),
         )
-        data = {"assets": asset_serializer.data, "licenses": license_serializer.data}
 
-        return Response(data)
+    def inventory_response(self, request, dependencies):
+        inventory = cached_data("inventory", dependencies, self.get_inventory)
+        if request.query_params.get("shape") == "merged":
+            return Response(inventory)
+
+        return Response(split_inventory(inventory))
+
+    @timed_function("serialize")
+    def get_inventory(self):
+        # Served in primary key order, as it always was.
+        developers = CustomUser.objects.get_developers().order_by("pk")
+        if fast_serializers_enabled():
+            return DeveloperInventorySerializer.values_data(developers)
+        return DeveloperInventorySerializer(
+            developers.prefetch_related("assets", "licenses"), many=True
+        ).data
 
     @swagger_auto_schema(
         request_body=SwaggDeveloperSerializer,
@@ -97,6 +153,14 @@ class DevelopersAPIView(APIView):
             user = form.save(commit=False)
             user.is_admin = False
             user.save()
+            preference = get_return_preference(request)
+            if preference:
+                return preferred_response(
+                    preference,
+                    user.pk,
+                    DeveloperSerializer(user).data,
+                    status=status.HTTP_201_CREATED,
+                )
             developers = CustomUser.objects.filter(is_admin=False)
             serializer = DeveloperSerializer(developers, many=True)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -104,30 +168,32 @@ class DevelopersAPIView(APIView):
         return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
-        request_body=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                "username": openapi.Schema(type=openapi.TYPE_STRING),
-                "email": openapi.Schema(type=openapi.TYPE_STRING),
-                "is_active": openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                "is_admin": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+        lambda openapi: {
+            "request_body": openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "username": openapi.Schema(type=openapi.TYPE_STRING),
+                    "email": openapi.Schema(type=openapi.TYPE_STRING),
+                    "is_active": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                    "is_admin": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                },
+                manual_parameters=[
+                    openapi.Parameter(
+                        "pk",
+                        openapi.IN_PATH,
+                        type=openapi.TYPE_INTEGER,
+                        description="The ID of the developer to update",
+                        required=True,
+                    ),
+                ],
+                required=["username"],
+            ),
+            "responses": {
+                200: openapi.Response(description="Updated developer successfully"),
+                400: openapi.Response(description="Invalid request data"),
+                401: openapi.Response(description="Not authorized"),
+                404: openapi.Response(description="Developer not found"),
             },
-            manual_parameters=[
-                openapi.Parameter(
-                    "pk",
-                    openapi.IN_PATH,
-                    type=openapi.TYPE_INTEGER,
-                    description="The ID of the developer to update",
-                    required=True,
-                ),
-            ],
-            required=["username"],
-        ),
-        responses={
-            200: openapi.Response(description="Updated developer successfully"),
-            400: openapi.Response(description="Invalid request data"),
-            401: openapi.Response(description="Not authorized"),
-            404: openapi.Response(description="Developer not found"),
         },
         operation_summary="Updates a developer",
         operation_description="Updates a developer identified by the given primary key",
@@ -148,6 +214,9 @@ class DevelopersAPIView(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            preference = get_return_preference(request)
+            if preference:
+                return preferred_response(preference, developer.pk, serializer.data)
             developers = CustomUser.objects.filter(is_admin=False)
             serializer = DeveloperSerializer(developers, many=True)
             return Response(serializer.data)
@@ -164,9 +233,35 @@ class AssetsAPIView(APIView):
                 {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
             )
 
+        dependencies = [(ASSETS, pk or ALL)]
+        return conditional_get(
+            request,
+            [self.get_queryset(pk)],
+            dependencies,
+            lambda: self.list_response(request, pk, dependencies),
+        )
+
+    def list_response(self, request, pk, dependencies):
+        data = cached_data(
+            "assets",
+            dependencies,
+            lambda: self.list_assets(request, pk),
+            params=request.query_params,
+        )
+        return Response(data)
+
+    def get_queryset(self, pk=None):
         assets = Asset.objects.filter(developer=pk) if pk else Asset.objects.all()
-        serializer = AssetSerializer(assets, many=True)
-        return Response(serializer.data)
+        return assets.order_by("pk")
+
+    def list_assets(self, request, pk):
+        assets = read_only_rows(AssetSerializer, self.get_queryset(pk))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(assets, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_data(read_only_data(AssetSerializer, page))
+
+        return read_only_data(AssetSerializer, assets)
 
     def post(self, request, pk):
         if not request.user.is_authenticated or not request.user.is_admin:
@@ -185,7 +280,15 @@ class AssetsAPIView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer.save(developer=developer)
+        run_write(lambda: serializer.save(developer=developer))
+        preference = get_return_preference(request)
+        if preference:
+            return preferred_response(
+                preference,
+                serializer.instance.pk,
+                serializer.data,
+                status=status.HTTP_201_CREATED,
+            )
         assets = Asset.objects.filter(developer=developer)
         serializer = AssetSerializer(assets, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -208,6 +311,13 @@ class AssetsAPIView(APIView):
                 {"error": "Asset not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        preference = get_return_preference(request)
+        if preference:
+            asset_id = asset.pk
+            deleted = AssetSerializer(asset).data
+            asset.delete()
+            return preferred_response(preference, asset_id, deleted)
+
         asset.delete()
         assets = Asset.objects.filter(developer=developer)
         serializer = AssetSerializer(assets, many=True)
@@ -223,9 +333,35 @@ class LicensesAPIView(APIView):
                 {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
             )
 
+        dependencies = [(LICENSES, pk or ALL)]
+        return conditional_get(
+            request,
+            [self.get_queryset(pk)],
+            dependencies,
+            lambda: self.list_response(request, pk, dependencies),
+        )
+
+    def list_response(self, request, pk, dependencies):
+        data = cached_data(
+            "licenses",
+            dependencies,
+            lambda: self.list_licenses(request, pk),
+            params=request.query_params,
+        )
+        return Response(data)
+
+    def get_queryset(self, pk=None):
         licenses = License.objects.filter(developer=pk) if pk else License.objects.all()
-        serializer = LicenseSerializer(licenses, many=True)
-        return Response(serializer.data)
+        return licenses.order_by("pk")
+
+    def list_licenses(self, request, pk):
+        licenses = read_only_rows(LicenseSerializer, self.get_queryset(pk))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(licenses, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_data(read_only_data(LicenseSerializer, page))
+
+        return read_only_data(LicenseSerializer, licenses)
 
     def post(self, request, pk):
         if not request.user.is_authenticated or not request.user.is_admin:
@@ -244,7 +380,15 @@ class LicensesAPIView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer.save(developer=developer)
+        run_write(lambda: serializer.save(developer=developer))
+        preference = get_return_preference(request)
+        if preference:
+            return preferred_response(
+                preference,
+                serializer.instance.pk,
+                serializer.data,
+                status=status.HTTP_201_CREATED,
+            )
         licenses = License.objects.filter(developer=developer)
         serializer = LicenseSerializer(licenses, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -267,7 +411,196 @@ class LicensesAPIView(APIView):
                 {"error": "License not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        preference = get_return_preference(request)
+        if preference:
+            license_id = license.pk
+            deleted = LicenseSerializer(license).data
+            license.delete()
+            return preferred_response(preference, license_id, deleted)
+
         license.delete()
         licenses = License.objects.filter(developer=developer)
         serializer = LicenseSerializer(licenses, many=True)
         return Response(serializer.data)
+
+
+class BulkAssignmentAPIView(APIView):
+    """
+    Assigns, deletes or reassigns many assets or licenses in one request.
+
+    POST takes a list of items validated with ``serializer_class(many=True)``.
+    On the ``<pk>/bulk/`` route every item goes to that developer; on the
+    global route each item names its own ``developer``. All rows are written
+    in one transaction with batched inserts.
+
+    DELETE (``{"ids": [...]}``) and PATCH (``{"ids": [...], "developer": id}``)
+    run a single set-based DELETE/UPDATE and return the affected row count.
+    On the ``<pk>/bulk/`` route only that developer's rows are touched.
+    """
+
+    permission_classes = [IsAuthenticated]
+    model = None
+    serializer_class = None
+    cache_collection = None
+    max_items = 5000
+    batch_size = 500
+
+    def post(self, request, pk=None):
+        if not request.user.is_authenticated or not request.user.is_admin:
+            return Response(
+                {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "Expected a non-empty list of items"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_items:
+            return Response(
+                {"error": f"At most {self.max_items} items per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.serializer_class(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        if pk is not None:
+            developer_ids = [pk] * len(items)
+        else:
+            developer_ids, errors = self.get_item_developer_ids(items)
+            if any(errors):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        requested = set(developer_ids)
+        found = set(
+            CustomUser.objects.get_developers()
+            .filter(pk__in=requested)
+            .values_list("pk", flat=True)
+        )
+        if requested - found:
+            return Response(
+                {
+                    "error": "Developer not found",
+                    "developers": sorted(requested - found),
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        objs = [
+            self.model(developer_id=developer_id, **attrs)
+            for developer_id, attrs in zip(developer_ids, serializer.validated_data)
+        ]
+        with transaction.atomic():
+            created = self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+            # bulk_create() sends no post_save signals.
+            invalidate(self.cache_collection, requested)
+
+        serializer = self.serializer_class(created, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, pk=None):
+        if not request.user.is_authenticated or not request.user.is_admin:
+            return Response(
+                {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        serializer = BulkIdsSerializer(
+            data=request.data, context={"max_items": self.max_items}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_bulk_queryset(pk, serializer.validated_data["ids"])
+        with transaction.atomic():
+            # QuerySet.delete() would fetch every row to send its post_delete
+            # signal, which only bumps cache counters: bump them once instead.
+            previous = set(queryset.values_list("developer_id", flat=True))
+            deleted = queryset._raw_delete(queryset.db)
+            invalidate(self.cache_collection, previous)
+        return Response({"deleted": deleted})
+
+    def patch(self, request, pk=None):
+        if not request.user.is_authenticated or not request.user.is_admin:
+            return Response(
+                {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        serializer = BulkReassignSerializer(
+            data=request.data, context={"max_items": self.max_items}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        developer = (
+            CustomUser.objects.get_developers()
+            .filter(pk=serializer.validated_data["developer"])
+            .first()
+        )
+        if developer is None:
+            return Response(
+                {"error": "Developer not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        queryset = self.get_bulk_queryset(pk, serializer.validated_data["ids"])
+        with transaction.atomic():
+            # update() sends no post_save signals.
+            previous = set(queryset.values_list("developer_id", flat=True))
+            reassigned = queryset.update(developer=developer, modified=timezone.now())
+            invalidate(self.cache_collection, previous | {developer.pk})
+        return Response({"reassigned": reassigned})
+
+    def get_bulk_queryset(self, pk, ids):
+        queryset = self.model.objects.filter(pk__in=ids)
+        if pk is not None:
+            queryset = queryset.filter(developer=pk)
+        return queryset
+
+    def get_item_developer_ids(self, items):
+        developer_ids, errors = [], []
+        for item in items:
+            try:
+                developer_ids.append(int(item["developer"]))
+                errors.append({})
+            except KeyError:
+                errors.append({"developer": ["This field is required."]})
+            except (TypeError, ValueError):
+                errors.append({"developer": ["A valid integer is required."]})
+        return developer_ids, errors
+
+
+class AssetsBulkAPIView(BulkAssignmentAPIView):
+    model = Asset
+    serializer_class = AssetSerializer
+    cache_collection = ASSETS
+
+
+class LicensesBulkAPIView(BulkAssignmentAPIView):
+    model = License
+    serializer_class = LicenseSerializer
+    cache_collection = LICENSES
+
+
+class InventoryExportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, export_format):
+        if not request.user.is_authenticated or not request.user.is_admin:
+            return Response(
+                {"error": "Not authorized"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": "Unknown export format"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        content_type, _ = EXPORT_FORMATS[export_format]
+        filename = f"inventory.{export_format}"
+        return StreamingHttpResponse(
+            iter_export(export_format),
+            content_type=content_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
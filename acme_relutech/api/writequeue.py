@@ -0,0 +1,155 @@
+"""
+Group commit for concurrent writes.
+
+SQLite has a single writer, so concurrent write requests queue for its lock
+and each pays for its own commit. With ``API_WRITE_QUEUE`` on, ``run_write``
+hands the write to one writer thread per process instead. The writer waits
+up to ``API_WRITE_QUEUE_MAX_DELAY_MS`` after the first pending write for
+others to arrive, runs up to ``API_WRITE_QUEUE_MAX_BATCH`` of them in a
+single transaction, each in its own savepoint, and commits once. Every
+caller gets its own return value or exception only after that commit; a
+write that fails rolls back its savepoint alone.
+
+Validate before calling ``run_write``: the writer should only save. It only
+sees concurrent writes of the same process, so it pays off with threaded
+workers (``manage.py serve --threads``) or under ASGI.
+"""
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+
+def write_queue_enabled():
+    return getattr(settings, "API_WRITE_QUEUE", False)
+
+
+class WriteQueue:
+    def __init__(self, max_batch=64, max_delay=0.002):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        # For benchmarks and tests.
+        self.committed_batches = 0
+        self.committed_writes = 0
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="api-write-queue", daemon=True
+                )
+                self.thread.start()
+
+    def submit(self, function, timeout=None):
+        """Run ``function()`` on the writer and return its result."""
+        future = Future()
+        # Run in the caller's context, so its request metrics see the queries.
+        function = partial(contextvars.copy_context().run, function)
+        self.start()
+        self.pending.put((function, future))
+        return future.result(timeout)
+
+    def stop(self):
+        """Let the writer finish what is queued, then end it."""
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def next_batch(self):
+        """Block for a write, then gather others for up to ``max_delay``."""
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.max_delay
+        while batch[-1] is not None and len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.pending.get(timeout=max(remaining, 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        try:
+            while True:
+                batch = self.next_batch()
+                stopping = batch[-1] is None
+                if stopping:
+                    batch.pop()
+                if batch:
+                    self.commit(batch)
+                if stopping:
+                    return
+        finally:
+            connection.close()
+
+    def commit(self, batch):
+        close_old_connections()
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for function, future in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((future, function(), None))
+                    except Exception as error:
+                        outcomes.append((future, None, error))
+        except Exception as error:
+            # The commit itself failed: none of the writes happened.
+            connection.close()
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        self.committed_batches += 1
+        self.committed_writes += len(batch)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteQueue(
+                max_batch=getattr(settings, "API_WRITE_QUEUE_MAX_BATCH", 64),
+                max_delay=getattr(settings, "API_WRITE_QUEUE_MAX_DELAY_MS", 2) / 1000,
+            )
+        return _write_queue
+
+
+def reset_write_queue():
+    """Stop the writer, so the next write starts one with current settings."""
+    global _write_queue
+    with _write_queue_lock:
+        write_queue, _write_queue = _write_queue, None
+    if write_queue is not None:
+        write_queue.stop()
+
+
+def run_write(function):
+    """
+    Return ``function()``, run through the write queue when
+    ``API_WRITE_QUEUE`` is on and directly otherwise, or when the caller is
+    inside a transaction the write must be part of.
+    """
+    if not write_queue_enabled() or connection.in_atomic_block:
+        return function()
+    # A caller that times out gets TimeoutError, but its write may still
+    # commit with a later batch.
+    timeout = getattr(settings, "API_WRITE_QUEUE_TIMEOUT", 10)
+    return get_write_queue().submit(function, timeout)
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 10:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0003_alter_asset_developer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0004_asset_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["developer", "type"], name="assets_developer_type_idx"
+            ),
+        ),
+    ]
@@ -23,3 +23,11 @@ class Asset(models.Model):
     developer = models.ForeignKey(
         CustomUser, on_delete=models.CASCADE, related_name="assets"
     )
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["developer", "type"], name="assets_developer_type_idx"
+            ),
+        ]
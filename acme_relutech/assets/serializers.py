@@ -1,11 +1,14 @@
 from accounts.models import CustomUser
+from api.values import ValuesSerializerMixin
 from assets.models import Asset
 from rest_framework import serializers
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     developer = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    value_columns = ("id", "brand", "model", "type", "developer_id")
+
     class Meta:
         model = Asset
         fields = ["id", "brand", "model", "type", "developer"]
@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
 from .models import Asset
+from .serializers import AssetSerializer
 
 
 class AssetTestCase(TestCase):
@@ -30,3 +32,31 @@ class AssetTestCase(TestCase):
         assets = Asset.objects.filter(developer=self.user)
         for asset in assets:
             self.assertEqual(asset.developer.username, "testwithasset")
+
+
+class AssetSerializerFastPathTestCase(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.first = User.objects.create_user(
+            email="first@acme.com", username="first", password="testpass"
+        )
+        self.second = User.objects.create_user(
+            email="second@acme.com", username="second", password="testpass"
+        )
+        for developer, asset_type in [
+            (self.first, Asset.LAPTOP),
+            (self.second, Asset.MONITOR),
+            (self.first, Asset.MOUSE),
+            (self.second, Asset.HEADSET),
+        ]:
+            Asset.objects.create(
+                brand="Dell", model="Ünïcode", type=asset_type, developer=developer
+            )
+
+    def test_values_data_is_byte_identical(self):
+        """Test that the fast path renders exactly like AssetSerializer"""
+        assets = Asset.objects.all()
+        self.assertEqual(
+            JSONRenderer().render(AssetSerializer.values_data(assets)),
+            JSONRenderer().render(AssetSerializer(assets, many=True).data),
+        )
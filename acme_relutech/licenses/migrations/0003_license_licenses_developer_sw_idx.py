@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("licenses", "0002_license_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="license",
+            index=models.Index(
+                fields=["developer", "software"], name="licenses_developer_sw_idx"
+            ),
+        ),
+    ]
@@ -8,3 +8,11 @@ class License(models.Model):
     developer = models.ForeignKey(
         CustomUser, on_delete=models.CASCADE, related_name="licenses"
     )
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["developer", "software"], name="licenses_developer_sw_idx"
+            ),
+        ]
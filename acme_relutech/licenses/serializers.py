@@ -1,11 +1,14 @@
 from accounts.models import CustomUser
+from api.values import ValuesSerializerMixin
 from licenses.models import License
 from rest_framework import serializers
 
 
-class LicenseSerializer(serializers.ModelSerializer):
+class LicenseSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     developer = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    value_columns = ("id", "software", "developer_id")
+
     class Meta:
         model = License
         fields = ["id", "software", "developer"]
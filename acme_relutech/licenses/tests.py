@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
 from .models import License
+from .serializers import LicenseSerializer
 
 
 class LicenseTestCase(TestCase):
@@ -30,3 +32,28 @@ class LicenseTestCase(TestCase):
         licenses = License.objects.filter(developer=self.user)
         for license in licenses:
             self.assertEqual(license.software, "Microsoft Office")
+
+
+class LicenseSerializerFastPathTestCase(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.first = User.objects.create_user(
+            email="first@acme.com", username="first", password="testpass"
+        )
+        self.second = User.objects.create_user(
+            email="second@acme.com", username="second", password="testpass"
+        )
+        for developer, software in [
+            (self.first, "PyCharm"),
+            (self.second, "Slack"),
+            (self.first, "Ünïcode Studio"),
+        ]:
+            License.objects.create(software=software, developer=developer)
+
+    def test_values_data_is_byte_identical(self):
+        """Test that the fast path renders exactly like LicenseSerializer"""
+        licenses = License.objects.all()
+        self.assertEqual(
+            JSONRenderer().render(LicenseSerializer.values_data(licenses)),
+            JSONRenderer().render(LicenseSerializer(licenses, many=True).data),
+        )